@@ -8,10 +8,8 @@ Creates a distributable .alfredworkflow file including all necessary assets
 
 import os
 import sys
-import shutil
 import subprocess
 import zipfile
-import tempfile
 from datetime import datetime
 
 class WorkflowBuilder:
@@ -38,41 +36,36 @@ class WorkflowBuilder:
         """Create Alfred workflow bundle"""
         print("\nCreating workflow bundle...")
         
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Copy all workflow files (except lib if it exists)
-            for item in os.listdir(self.workflow_dir):
-                if item != 'lib':  # Skip lib directory
-                    src = os.path.join(self.workflow_dir, item)
-                    dst = os.path.join(temp_dir, item)
-                    if os.path.isfile(src):
-                        shutil.copy2(src, dst)
-                    elif os.path.isdir(src):
-                        shutil.copytree(src, dst)
+        # Create output directory if it doesn't exist
+        os.makedirs(self.dist_dir, exist_ok=True)
 
-            # Create output directory if it doesn't exist
-            os.makedirs(self.dist_dir, exist_ok=True)
+        # Create workflow bundle
+        output_file = os.path.join(
+            self.dist_dir,
+            f'Natural-Calendar-{self.version}.alfredworkflow'
+        )
 
-            # Create workflow bundle
-            output_file = os.path.join(
-                self.dist_dir,
-                f'Natural-Calendar-{self.version}.alfredworkflow'
-            )
-
-            # Remove existing file if it exists
-            if os.path.exists(output_file):
-                os.remove(output_file)
+        # Remove existing file if it exists
+        if os.path.exists(output_file):
+            os.remove(output_file)
 
-            # Create workflow bundle
-            with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        zipf.write(file_path, arcname)
+        # Zip straight from the workflow directory (except lib if it exists);
+        # the files are small text, so fast compression costs almost no size
+        with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+            for root, dirs, files in os.walk(self.workflow_dir):
+                if root == self.workflow_dir and 'lib' in dirs:
+                    dirs.remove('lib')  # Skip lib directory
+                if '__pycache__' in dirs:
+                    # Alfred's Python writes its own bytecode on first run; a
+                    # .pyc from the build interpreter only fits that version
+                    dirs.remove('__pycache__')
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    arcname = os.path.relpath(file_path, self.workflow_dir)
+                    zipf.write(file_path, arcname)
 
-            print(f"✓ Workflow bundle created: {output_file}")
-            return output_file
+        print(f"✓ Workflow bundle created: {output_file}")
+        return output_file
 
     def verify_files(self):
         """Verify all required files exist"""
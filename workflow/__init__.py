@@ -1,4 +1,11 @@
 # Empty file to make the directory a Python package 
+import re
+
+# google-re2 matches in linear time; fall back to the stdlib engine without it
+try:
+    import re2 as _fast_re
+except ImportError:
+    _fast_re = None
 
 # Time pattern components
 TIME_COMPONENTS = {
@@ -27,16 +34,41 @@ def build_base_time_pattern():
             f"{TIME_COMPONENTS['spaces']}"
             r"[ap](?:\s*m)?\b")
 
+def compile_pattern(pattern):
+    """Compile a case-insensitive pattern, using re2 when it is installed"""
+    if _fast_re is not None:
+        try:
+            # Inline flag, re2 does not take the stdlib flag constants
+            return _fast_re.compile('(?i)' + pattern)
+        except Exception:
+            pass  # Syntax re2 can't handle, use the stdlib engine
+    return re.compile(pattern, re.IGNORECASE)
+
+# Compiled once at import so callers don't rebuild and recompile per call
+# (a pickled pattern only stores its source and flags, so shipping one
+# would still recompile on load)
+TIME_PATTERN_RE = compile_pattern(build_time_pattern())
+BASE_TIME_PATTERN_RE = compile_pattern(build_base_time_pattern())
+
+# A calendar tag: #Name, #"Two Words" or #'Two Words', one group per form
+CALENDAR_TAG_RE = re.compile(r'#(?:"([^"]+)"|\'([^\']+)\'|([^"\'\s]+))')
+
+# 24-hour value for every (meridiem, hour) the time pattern can capture,
+# covering both cases of the meridiem so no lowercasing is needed
+_HOUR_ADJ = {}
+for _hour in range(100):
+    for _meridiem in 'aA':
+        _HOUR_ADJ[(_meridiem, _hour)] = 0 if _hour == 12 else _hour
+    for _meridiem in 'pP':
+        _HOUR_ADJ[(_meridiem, _hour)] = _hour if _hour == 12 else _hour + 12
+del _hour, _meridiem
+
+def to_24_hour(hour, meridiem):
+    """24-hour value of hour; only the meridiem's first letter counts, none keeps hour as is"""
+    return _HOUR_ADJ[(meridiem[0], hour)] if meridiem else hour
+
 # Shared time parsing function
 def parse_time_match(match):
-    """Parse time from regex match"""
-    hour = int(match.group(1))
-    minutes = int(match.group(2)) if match.group(2) else 0
-    meridiem = match.group(3).lower()  # Will be 'a' or 'p'
-    
-    if meridiem == 'p' and hour != 12:
-        hour += 12
-    elif meridiem == 'a' and hour == 12:
-        hour = 0
-        
-    return hour, minutes 
\ No newline at end of file
+    """Parse time from a TIME_PATTERN_RE match"""
+    hour, minutes, meridiem = match.groups()
+    return _HOUR_ADJ[(meridiem, int(hour))], int(minutes) if minutes else 0
@@ -3,55 +3,82 @@
 
 import sys
 import os
-import subprocess
-import json
 import re
+import time
+import functools
 from datetime import datetime, timedelta, date
-import urllib.parse
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Iterable, Optional, List, Tuple
 
 # Setup imports
 if __name__ == '__main__':
     from utils import setup_imports
     setup_imports()
     # Use absolute imports when running directly
-    from __init__ import build_time_pattern, build_base_time_pattern, parse_time_match
+    from __init__ import (build_time_pattern, build_base_time_pattern, compile_pattern,
+                          TIME_PATTERN_RE, CALENDAR_TAG_RE, parse_time_match, to_24_hour)
     from logger import setup_logger
     from config import get_testing_mode
+    from utils import (get_workflow_data_dir, write_file_deferred, fetch_writable_calendars,
+                       load_calendar_cache_refreshing, save_calendar_cache, run_applescript,
+                       json_dumps, json_loads)
 else:
     # Use relative imports when imported as module
-    from . import build_time_pattern, build_base_time_pattern, parse_time_match
+    from . import (build_time_pattern, build_base_time_pattern, compile_pattern,
+                   TIME_PATTERN_RE, CALENDAR_TAG_RE, parse_time_match, to_24_hour)
     from .logger import setup_logger
     from .config import get_testing_mode
-
-# Make dateutil optional - only needed for certain date parsing features
-try:
-    from dateutil import parser, relativedelta
-    HAVE_DATEUTIL = True
-except ImportError:
-    HAVE_DATEUTIL = False
+    from .utils import (get_workflow_data_dir, write_file_deferred, fetch_writable_calendars,
+                        load_calendar_cache_refreshing, save_calendar_cache, run_applescript,
+                        json_dumps, json_loads)
 
 # Get logger with testing mode
 logger = setup_logger('calendar_nlp', testing=get_testing_mode())
 
+# Seconds a verified location is reused from the on-disk cache
+LOCATION_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Written to lib/ once dependencies are in place; rename it whenever
+# setup.py changes so existing installs run setup again
+DEPS_SENTINEL = '.deps_ok'
+
+# Resolved once; ensure_dependencies and the lib/ import path share them
+_WORKFLOW_DIR = os.path.dirname(os.path.abspath(__file__))
+_LIB_DIR = os.path.join(_WORKFLOW_DIR, 'lib')
+_DEPS_SENTINEL_PATH = os.path.join(_LIB_DIR, DEPS_SENTINEL)
+
+def _mark_dependencies_ok(sentinel):
+    """Create the sentinel so later launches skip the dependency check"""
+    try:
+        open(sentinel, 'w').close()
+    except OSError:
+        pass  # Read-only install; the dateutil check still works
+
 def ensure_dependencies():
     """Ensure all required dependencies are installed"""
     # Only check dependencies when running in Alfred
     if not os.getenv('alfred_workflow_data'):
         return
 
-    workflow_dir = os.path.dirname(os.path.abspath(__file__))
-    lib_dir = os.path.join(workflow_dir, 'lib')
+    sentinel = _DEPS_SENTINEL_PATH
+    
+    # One stat on the sentinel settles every launch after the first
+    if os.path.exists(sentinel):
+        return
     
-    if not os.path.exists(lib_dir) or not os.path.exists(os.path.join(lib_dir, 'dateutil')):
-        setup_script = os.path.join(workflow_dir, 'setup.py')
+    if os.path.exists(os.path.join(_LIB_DIR, 'dateutil')):
+        # Installed before the sentinel existed
+        _mark_dependencies_ok(sentinel)
+    else:
+        import subprocess  # Only needed to run setup
+        setup_script = os.path.join(_WORKFLOW_DIR, 'setup.py')
         try:
             subprocess.run([sys.executable, setup_script], 
                          check=True,
                          stdout=subprocess.DEVNULL,  # Hide stdout
                          stderr=subprocess.DEVNULL)  # Hide stderr
+            _mark_dependencies_ok(sentinel)
             
-            print(json.dumps({
+            print(json_dumps({
                 "alfredworkflow": {
                     "arg": "Setup complete. Please try again.",
                     "variables": {
@@ -61,7 +88,7 @@ def ensure_dependencies():
             }))
             sys.exit(0)
         except subprocess.CalledProcessError:
-            print(json.dumps({
+            print(json_dumps({
                 "alfredworkflow": {
                     "arg": "Setup failed. Please check the workflow logs.",
                     "variables": {
@@ -74,187 +101,412 @@ def ensure_dependencies():
 # Run dependency check before any other imports
 ensure_dependencies()
 
-# Now it's safe to import other modules
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib'))
-from dateutil import parser, relativedelta
-import re
-from datetime import datetime, timedelta, date
-import urllib.parse
-from typing import Dict, Optional, List, Tuple
-
-def get_workflow_data_dir():
-    """Get Alfred workflow data directory"""
-    data_dir = os.getenv('alfred_workflow_data')
-    if not data_dir:
-        data_dir = os.path.expanduser('~/Library/Application Support/Alfred/Workflow Data/com.ariestwn.calendar.nlp')
+# dateutil is installed to lib/ and imported where it's used, since most
+# texts never reach it and importing it costs more than parsing them
+sys.path.insert(0, _LIB_DIR)
+
+# Weekday names and abbreviations to iCalendar BYDAY codes
+_WEEKDAY_MAP = {
+    'monday': 'MO', 'tuesday': 'TU', 'wednesday': 'WE', 'thursday': 'TH',
+    'friday': 'FR', 'saturday': 'SA', 'sunday': 'SU',
+    'mon': 'MO', 'tue': 'TU', 'wed': 'WE', 'thu': 'TH',
+    'fri': 'FR', 'sat': 'SA', 'sun': 'SU'
+}
+
+# Every weekday spelling above is told apart by its first three letters,
+# so BYDAY lookups go through this 7-entry table keyed on day[:3]
+_WEEKDAY_CODES = {day[:3]: code for day, code in _WEEKDAY_MAP.items()}
+
+# Weekday number (Monday is 0, as datetime.weekday) for every spelling
+_WEEKDAY_NUMBERS = {day: list(_WEEKDAY_CODES).index(day[:3]) for day in _WEEKDAY_MAP}
+
+# Month number for every full and three-letter month name
+_MONTHS = ('january', 'february', 'march', 'april', 'may', 'june', 'july',
+           'august', 'september', 'october', 'november', 'december')
+_MONTH_NUMBERS = {name: number for number, month in enumerate(_MONTHS, 1)
+                  for name in (month, month[:3])}
+
+def _parse_range_date(date_str, default):
+    """Parse one end of a date range, filling missing fields from default
+
+    "8/9", "8/9/2025" and "August 9" are built directly; anything else,
+    including two-digit years and day-first dates, goes to dateutil.
+    """
+    try:
+        if '/' in date_str:
+            parts = date_str.split('/')
+            if len(parts) == 2:
+                return default.replace(month=int(parts[0]), day=int(parts[1]))
+            if len(parts[2]) == 4:
+                return default.replace(year=int(parts[2]), month=int(parts[0]), day=int(parts[1]))
+        else:
+            name, day = date_str.split()
+            month = _MONTH_NUMBERS.get(name.lower())
+            if month:
+                return default.replace(month=month, day=int(day))
+    except ValueError:
+        pass
+    from dateutil import parser
+    return parser.parse(date_str, default=default)
+
+# Full weekday names, found anywhere in the text
+_FULL_WEEKDAY_RE = re.compile('|'.join(day for day in _WEEKDAY_MAP if len(day) > 3))
+
+def _next_week_after(date, now):
+    """date moved forward by whole weeks until it is later than now"""
+    if date > now:
+        return date
+    return date + timedelta(weeks=(now - date) // timedelta(weeks=1) + 1)
+
+def _days_until_weekday(current, target):
+    """Days from weekday current to the next target, a full week when they're the same day"""
+    return (target - current) % 7 or 7
+
+# Patterns below are built and compiled once at import and shared by
+# every processor. Plain case-insensitive ones go through compile_pattern
+# and run on re2 when it's installed; those needing lookaround, lookups of
+# named groups, verbose mode or case-sensitive matching stay on the stdlib
+# engine
+
+# Weekdays pattern
+_WEEKDAYS = '|'.join(_WEEKDAY_MAP.keys())
+_WEEKDAYS_RE = re.compile(_WEEKDAYS)
+# A weekday as a whole word, so "monthly" or "sunset" don't name a day
+_WEEKDAY_WORD_RE = re.compile(rf'\b(?:{_WEEKDAYS})\b')
+
+# Time pattern sources for composing (TIME_PATTERN_RE is the compiled form)
+_TIME_PATTERN = build_time_pattern()
+_BASE_TIME_PATTERN = build_base_time_pattern()
+# "in 30 minutes" / "in 2 hours"; the named unit group that matched picks
+# the timedelta argument, so the unit text never needs inspecting
+_RELATIVE_TIME_PATTERN = r'\bin\s+(\d+)\s*(?:(?P<hours>h(?:ours?)?)|(?P<minutes>m(?:in(?:ute)?s?)?))\b'
+_RELATIVE_TIME_RE = re.compile(_RELATIVE_TIME_PATTERN, re.IGNORECASE)
+
+# Date range pattern
+_DATE_RANGE_RE = compile_pattern(
+    r'from\s+(\w+\s+\d{1,2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?)\s*(?:-|to)\s*(\w+\s+\d{1,2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?)')
+
+# Location pattern - handles all location cases
+_LOCATION_RE = re.compile(
+    fr'@\s*([A-Za-z0-9][A-Za-z0-9\s&\.\'+\-]*?)(?=\s+(?:{_TIME_PATTERN}|tomorrow|today|next|every)|$)',
+    re.IGNORECASE)
+
+# Ordinal number with its suffix split off ("3 rd"), joined in one pass
+_ORDINAL_RE = re.compile(r'(\d+)\s*(st|nd|rd|th)\b')
+
+# Location text that is really part of the notes, URL or an alert; matched
+# against the lowercased location
+_LOCATION_SKIP_RE = re.compile(r'notes:|url:|link:|alert|remind')
+
+# Separates the "name|..." entries the Contacts and Maps lookups print;
+# unlike ', ' it never occurs inside an address
+_MATCH_SEP = '\x1f'
+
+# AppleScript location lookups of searchText, each returning its source's
+# name followed by "name|label|address" or "name|address" entries, joined
+# with _MATCH_SEP. Each falls through when nothing matches, so Contacts can
+# run ahead of Maps. A Contacts error, such as access not yet granted, is
+# reported as "failed" once nothing else matched; Maps has no scripting
+# support on many systems, so its errors count as no match
+_CONTACTS_LOOKUP = '''
+    try
+        tell application "Contacts"
+            set matchingContacts to {}
+            repeat with theContact in every person
+                repeat with theAddress in every address of theContact
+                    set addressText to formatted address of theAddress as string
+                    if addressText contains searchText then
+                        -- Get contact details
+                        set contactName to name of theContact
+                        set addressLabel to label of theAddress
+                        if addressLabel is missing value then
+                            set addressLabel to "address"
+                        end if
+                        set contactInfo to contactName & "|" & addressLabel & "|" & addressText
+                        copy contactInfo to the end of matchingContacts
+                    end if
+                end repeat
+            end repeat
+        end tell
+        if matchingContacts is not {} then
+            set beginning of matchingContacts to "contacts"
+            set AppleScript's text item delimiters to character id 31
+            set matchText to matchingContacts as text
+            set AppleScript's text item delimiters to ""
+            return matchText
+        end if
+    on error
+        set lookupFailed to true
+    end try
+'''
+_MAPS_LOOKUP = '''
+    tell application "Maps"
+        try
+            set searchResults to search for searchText
+            set matchingLocations to {"maps"}
+            repeat with i from 1 to count of searchResults
+                if i > 3 then exit repeat -- Limit to top 3 results
+                set theResult to item i of searchResults
+                copy (name of theResult & "|" & address of theResult) to the end of matchingLocations
+            end repeat
+            if (count of matchingLocations) > 1 then
+                set AppleScript's text item delimiters to character id 31
+                set matchText to matchingLocations as text
+                set AppleScript's text item delimiters to ""
+                return matchText
+            end if
+        end try
+    end tell
+'''
+
+def _lookup_script(*lookups: str) -> str:
+    """A script running the lookups in order on the location it's passed"""
+    return ('on run argv\n    set searchText to item 1 of argv\n    set lookupFailed to false'
+            + ''.join(lookups)
+            + '    if lookupFailed then return "failed"\n    return ""\nend run\n')
+
+_MAPS_LOOKUP_SCRIPT = _lookup_script(_MAPS_LOOKUP)
+_LOCATION_LOOKUP_SCRIPT = _lookup_script(_CONTACTS_LOOKUP, _MAPS_LOOKUP)
+
+# Alert patterns and their minutes: per unit of the captured number, or
+# the whole alert for the natural language ones that capture none
+_ALERT_SOURCES = [
+    # Basic minutes/hours
+    (r'(\d+)\s*min(?:ute)?s?\s*(?:alert|reminder)', 1),
+    (r'(\d+)\s*hour(?:s)?\s*(?:alert|reminder)', 60),
+    # Before cases
+    (r'(?:alert|remind)\s+(\d+)\s*min(?:ute)?s?\s*before', 1),
+    (r'(?:alert|remind)\s+(\d+)\s*hour(?:s)?\s*before', 60),
+    # With cases
+    (r'with\s+(\d+)\s*min(?:ute)?s?\s*(?:alert|reminder)', 1),
+    (r'with\s+(\d+)\s*hour(?:s)?\s*(?:alert|reminder)', 60),
+    # Natural language
+    (r'(?:with\s+)?(?:an?\s+hour)\s*(?:alert|reminder|before)', 60),
+    (r'(?:with\s+)?(?:half\s*(?:an?\s*)?hour)\s*(?:alert|reminder|before)', 30),
+]
+
+# All alert patterns as one alternation, each wrapped in a group. The
+# wrapping group closes last, so match.lastindex names the branch and
+# the branch's own number, if any, is the group right after it. The
+# lookahead keeps matches zero-width so, as with a scan per pattern,
+# alerts can overlap ("for 2 hours alert 1 hour before"); the lookbehind
+# stops a scan from starting again inside a number
+_ALERT_RE = re.compile(r'(?<!\d)(?=%s)' % '|'.join(f'({pattern})' for pattern, _ in _ALERT_SOURCES),
+                       re.IGNORECASE)
+# Branch group -> (minutes, whether the branch captures a number)
+_ALERT_MINUTES = {}
+_group = 1
+for _pattern, _minutes in _ALERT_SOURCES:
+    _groups = re.compile(_pattern).groups
+    _ALERT_MINUTES[_group] = (_minutes, _groups > 0)
+    _group += 1 + _groups
+del _group, _groups, _pattern, _minutes
+
+# Duration pattern
+_TIME_RANGE_RE = compile_pattern(
+    r'(\d{1,2})(?::(\d{2}))?\s*([ap]m?)?\s*(?:-|to)\s*(\d{1,2})(?::(\d{2}))?\s*([ap]m?)?')
+
+def _range_minutes(start_minutes, end_minutes, default):
+    """Minutes between two times of day, an end before the start being the next day's"""
+    if end_minutes < start_minutes:
+        end_minutes += 24 * 60
+    duration = end_minutes - start_minutes
+    return duration if duration > 0 else default
+
+# URL and notes prefixes
+_URL_PREFIXES = r'(?:url|link|meet(?:ing)?(?:\s+link)?|zoom|teams)'
+_NOTE_PREFIXES = r'(?:notes?|description|details?)'
+
+# URL patterns - a labeled URL, or a bare meeting link
+_LABELED_URL_PATTERN = rf'{_URL_PREFIXES}:\s*(?P<labeled>https?://[^\s]+)'
+_LABELED_URL_RE = re.compile(_LABELED_URL_PATTERN, re.IGNORECASE)
+_URL_RE = re.compile(
+    rf'{_LABELED_URL_PATTERN}|'
+    r'(?P<meeting>(?:https?://)?(?:[\w-]+\.)*'
+    r'(?:zoom\.us|teams\.microsoft\.com|meet\.google\.com)/[^\s]+)',
+    re.IGNORECASE)
+
+# Notes patterns
+_NOTES_PATTERNS = [
+    re.compile(rf'{_NOTE_PREFIXES}:\s*([^|]+?)(?=\s+(?:{_URL_PREFIXES}):|\s*$)', re.IGNORECASE)
+]
+
+# Markers that drop everything from themselves to the end of the title
+_TO_END_PATTERNS = [
+    r'\b(?:tomorrow|today|next|on|at|from|to|daily|weekly|monthly)\b',
+    _BASE_TIME_PATTERN,
+    _RELATIVE_TIME_PATTERN,
+    r'for\s+\d+\s+(?:day|hour|minute|min)s?',
+    r'(?:alert|remind)',
+]
+
+# Patterns to remove from the title, applied as one alternation. The
+# markers above share a single .*$ tail. No marker and weekday can match
+# at the same position, so moving the weekday after them changes nothing
+_PATTERNS_TO_REMOVE = [
+    r'\bevery\b\s+\w+',
+    '(?:' + '|'.join(_TO_END_PATTERNS) + ').*$',
+    r'\b(?:mon|tue|wed|thu|fri|sat|sun)(?:day)?',
+    r'url\s+https?://\S+',
+]
+_REMOVE_RE = compile_pattern('|'.join(f'(?:{p})' for p in _PATTERNS_TO_REMOVE))
+
+# Location markers are removed in a second pass, their lookahead
+# relies on the title end left behind by the patterns above
+_LOCATION_MARKER_RE = re.compile(r'@\s*[^@\s][^@]*(?=\s+(?:at|tomorrow|next|\d|\$|$))', re.IGNORECASE)
+
+# Anything clean_title could remove; titles without a hit skip the patterns
+_TITLE_PREFILTER_RE = compile_pattern(
+    r'\d|[@:/]|\b(?:every|tomorrow|today|next|on|at|from|to|daily|weekly|monthly)\b|'
+    r'\b(?:mon|tue|wed|thu|fri|sat|sun)|alert|remind|\s(?:in|for)\s*$')
+
+# Trailing "for", then "in", then "at", as the separate passes stripped them
+_TRAILING_WORDS_RE = re.compile(r'(?:\s+at)?(?:\s+in)?(?:\s+for)?\s*$')
+
+# Section patterns, one named branch per section so a single scan finds them all
+_SECTIONS_RE = re.compile(r'''
+    ^(?P<event_type>meeting|lunch|dinner|coffee|call|zoom|standup|training|class)
+  | @\s*(?P<location>[^@](?:.*?@[^@]+)*?.*?)(?=\s+(?:at\s+\d|tomorrow|next|every|$))  # Handle multiple @ parts
+  | (?:at\s+)?(?P<time>\d{1,2}(?::\d{2})?\s*(?:am?|pm?))
+  | (?P<date>tomorrow|today|next\s+\w+|\d{1,2}/\d{1,2}(?:/\d{2,4})?)
+  | (?P<recurrence>every\s+(?:day|week|month|year|monday|tuesday|wednesday|thursday|friday|saturday|mon|tue|wed|thu|fri|sat|sun))
+''', re.IGNORECASE | re.VERBOSE)
+
+# Markers that every match of a parse_event sub-parser contains: a colon
+# or slash for URLs and notes, "from" for date ranges, a digit for times
+# and durations, the alert words, @ for locations and "every" for
+# recurrences. This one scan stands in for a combined tokenizer, which
+# couldn't keep the sub-parsers' own precedence and lookaheads
+_FEATURE_RE = re.compile(
+    r'(?P<link>[:/])|(?P<range>from)|(?P<number>\d)|(?P<alert>alert|remind|before)|(?P<place>@)|'
+    r'(?P<recur>every)', re.IGNORECASE)
+
+# Recurrence pattern - one named branch per rule. Rules keep the
+# priority of their order below, whatever their position in the text
+_EVERY_RE = compile_pattern(r'\bevery\b')
+_RECURRENCE_RE = re.compile(
+    r'every\s+(?:'
+    # One weekday match shared by the multiple day, until date and single
+    # day rules, which branch on what follows it
+    rf'(?P<first_day>{_WEEKDAYS})(?:'
+    rf'(?P<multi>(?:\s+and\s+(?:{_WEEKDAYS}))+)|'
+    r'(?P<until>\s+until\s+(?P<until_date>\d{1,2}/\d{1,2}(?:/\d{2,4})?)\b)|'
+    r'(?P<single>\b))|'
+    # Simple frequencies
+    r'(?P<week>week(?:ly)?\b)|(?P<day>day)|(?P<month>month)|(?P<year>year))|'
+    r'(?P<daily>daily\b)|(?P<monthly>monthly\b)|(?P<yearly>yearly|annually\b)'
+)
+_RECURRENCE_RANK = {
+    'multi': 0, 'until': 1, 'single': 2, 'week': 3,
+    'day': 4, 'daily': 4, 'month': 5, 'monthly': 5, 'year': 6, 'yearly': 6,
+}
+_SIMPLE_RECURRENCE = {
+    'week': 'FREQ=WEEKLY', 'day': 'FREQ=DAILY', 'daily': 'FREQ=DAILY',
+    'month': 'FREQ=MONTHLY', 'monthly': 'FREQ=MONTHLY',
+    'year': 'FREQ=YEARLY', 'yearly': 'FREQ=YEARLY',
+}
+
+# Cleanup patterns
+_SPACES_RE = re.compile(r'\s+')
+_GLUED_AT_RE = re.compile(r'(?<=[A-Za-z0-9])@(?=[A-Za-z0-9])')
+_LETTER_DIGIT_RE = re.compile(r'([A-Za-z])(\d)')
+_TRAILING_DATE_WORD_RE = re.compile(r'\s+(?:tomorrow|today|next|every)\s*$', re.IGNORECASE)
+# Any http(s) URL, with the url:/link: label in front of it if there is one
+_CLEAN_RE = compile_pattern(r'(?:(?:url|link):\s*)?https?://\S+')
+
+@functools.lru_cache(maxsize=128)
+def _labeled_url_re(url: str):
+    """Compiled pattern for url behind a url:/link: label"""
+    return re.compile(r'(?:url|link):\s*' + re.escape(url))
+
+def search_contact_addresses(location: str) -> Optional[List[str]]:
+    """Find Contacts addresses containing location, as "name|label|address"
+
+    Returns None when the Contacts framework (PyObjC) is not available.
+    """
+    try:
+        from Contacts import (CNContactStore, CNContactFetchRequest, CNContactFormatter,
+                              CNContactFormatterStyleFullName, CNContactPostalAddressesKey,
+                              CNLabeledValue, CNPostalAddressFormatter,
+                              CNPostalAddressFormatterStyleMailingAddress)
+    except ImportError:
+        return None
     
-    # Create directory if it doesn't exist
-    os.makedirs(data_dir, exist_ok=True)
-    return data_dir
+    keys = [CNContactFormatter.descriptorForRequiredKeysForStyle_(CNContactFormatterStyleFullName),
+            CNContactPostalAddressesKey]
+    request = CNContactFetchRequest.alloc().initWithKeysToFetch_(keys)
+    needle = location.casefold()
+    matches = []
+    
+    def visit(contact, stop):
+        for labeled in contact.postalAddresses():
+            address = CNPostalAddressFormatter.stringFromPostalAddress_style_(
+                labeled.value(), CNPostalAddressFormatterStyleMailingAddress)
+            if needle in address.casefold():
+                name = CNContactFormatter.stringFromContact_style_(
+                    contact, CNContactFormatterStyleFullName) or ''
+                label = labeled.label()
+                label = CNLabeledValue.localizedStringForLabel_(label) if label else 'address'
+                matches.append(f"{name}|{label}|{address}")
+    
+    ok, _ = CNContactStore.alloc().init().enumerateContactsWithFetchRequest_error_usingBlock_(
+        request, None, visit)
+    return matches if ok else None
 
 class CalendarNLPProcessor:
     def __init__(self):
         logger.debug("Initializing CalendarNLPProcessor")
-        self.calendars = self.get_available_calendars()
-        self.config = self.load_config()
-        
-        # Define weekday_map first
-        self.weekday_map = {
-            'monday': 'MO', 'tuesday': 'TU', 'wednesday': 'WE', 'thursday': 'TH',
-            'friday': 'FR', 'saturday': 'SA', 'sunday': 'SU',
-            'mon': 'MO', 'tue': 'TU', 'wed': 'WE', 'thu': 'TH',
-            'fri': 'FR', 'sat': 'SA', 'sun': 'SU'
-        }
-        
-        # Create weekdays pattern
-        self.weekdays = '|'.join(self.weekday_map.keys())
-        
-        # Calendar pattern
-        self.calendar_pattern = r'#(?:"([^"]+)"|\'([^\']+)\'|([^"\'\s]+))'
-        
-        # Build time patterns from components
-        self.time_pattern = build_time_pattern()
-        self._base_time = build_base_time_pattern()
-        self.relative_time_pattern = r'in\s+(\d+)\s+(?:min(?:ute)?s?|hours?)'
-        
-        # Date range pattern
-        self.date_range_pattern = r'from\s+(\w+\s+\d{1,2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?)\s*(?:-|to)\s*(\w+\s+\d{1,2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?)'
-        
-        # Location patterns
-        self.location_patterns = [
-            # Basic location with @ marker
-            r'''(?:^|\s)@\s*
-                (
-                    (?:[A-Za-z0-9][A-Za-z0-9\s&\.'+-]*?)
-                    (?:\s*@\s*[A-Za-z0-9][A-Za-z0-9\s&\.'+-]*?)*?
-                )
-                (?=
-                    \s+(?:\d{1,2}(?::\d{2})?\s*(?:am?|pm?)|
-                    (?:[01]\d|2[0-3]):[0-5]\d|
-                    tomorrow|today|next|every)|
-                    \s*$
-                )
-            ''',
-            r'(?:online|virtual)\s*meeting'
-        ]
-        
-        # Location pattern - handles all location cases
-        self.location_pattern = fr'@\s*([A-Za-z0-9][A-Za-z0-9\s&\.\'+\-]*?)(?=\s+(?:{self.time_pattern}|tomorrow|today|next|every)|$)'
-        
-        # Ordinal number patterns
-        self.ordinal_patterns = [
-            (r'(\d+)\s*(?:st)\b', r'\1st'),
-            (r'(\d+)\s*(?:nd)\b', r'\1nd'),
-            (r'(\d+)\s*(?:rd)\b', r'\1rd'),
-            (r'(\d+)\s*(?:th)\b', r'\1th'),
-        ]
-        
-        # Update patterns to better handle numbers and "at"
-        self.number_patterns = [
-            # Handle numbers after keywords with optional "at"
-            (r'((?:Floor|Level|Room|St\.?|Street|Ave\.?|Avenue)\s*(?:at\s*)?)(\d+)(st|nd|rd|th)?(?=\s|$)', r'\1\2\3'),
-            
-            # Handle ordinal numbers before keywords
-            (r'(\d+)(st|nd|rd|th)\s+(Floor|Level|Room)', r'\1\2 \3'),
-            
-            # Handle plain numbers with keywords
-            (r'(\d+)(st|nd|rd|th)?\s+(Floor|Level|Room)', r'\1\2 \3'),
-            
-            # Handle street addresses
-            (r'(\d+)(st|nd|rd|th)?\s+(St\.?|Street|Ave\.?|Avenue)', r'\1\2 \3'),
-            
-            # Handle building numbers
-            (r'(Building|Room)\s+(\d+)', r'\1 \2')
-        ]
-        
-        # Location keywords that should keep "at"
-        self.location_keywords = ['floor', 'level', 'room', 'street', 'st', 'ave', 'avenue']
-        
-        # Update alert patterns to handle all cases
-        self.alert_patterns = {
-            # Basic minutes/hours
-            r'(\d+)\s*min(?:ute)?s?\s*(?:alert|reminder)': 'minutes',
-            r'(\d+)\s*hour(?:s)?\s*(?:alert|reminder)': 'hours',
-            # Before cases
-            r'(?:alert|remind)\s+(\d+)\s*min(?:ute)?s?\s*before': 'minutes',
-            r'(?:alert|remind)\s+(\d+)\s*hour(?:s)?\s*before': 'hours',
-            # With cases
-            r'with\s+(\d+)\s*min(?:ute)?s?\s*(?:alert|reminder)': 'minutes',
-            r'with\s+(\d+)\s*hour(?:s)?\s*(?:alert|reminder)': 'hours',
-            # Natural language
-            r'(?:with\s+)?(?:an?\s+hour)\s*(?:alert|reminder|before)': 'natural_hour',
-            r'(?:with\s+)?(?:half\s*(?:an?\s*)?hour)\s*(?:alert|reminder|before)': 'natural_half'
-        }
-        
-        # Duration patterns
-        self.duration_patterns = {
-            'time_range': r'(\d{1,2})(?::(\d{2}))?\s*([ap]m?)?\s*(?:-|to)\s*(\d{1,2})(?::(\d{2}))?\s*([ap]m?)?'
-        }
-        
-        # URL and notes prefixes
-        self._url_prefixes = r'(?:url|link|meet(?:ing)?(?:\s+link)?|zoom|teams)'
-        self._note_prefixes = r'(?:notes?|description|details?)'
-        
-        # URL patterns - updated for better matching
-        self.url_patterns = [
-            rf'{self._url_prefixes}:\s*((?:https?://)[^\s]+)',
-            r'((?:https?://)?(?:[\w-]+\.)*zoom\.us/[^\s]+)',
-            r'((?:https?://)?(?:[\w-]+\.)*teams\.microsoft\.com/[^\s]+)',
-            r'((?:https?://)?(?:[\w-]+\.)*meet\.google\.com/[^\s]+)'
-        ]
-        
-        # Notes patterns
-        self.notes_patterns = [
-            rf'{self._note_prefixes}:\s*([^|]+?)(?=\s+(?:{self._url_prefixes}):|\s*$)'
-        ]
-
-        # Add pattern to remove locations from title
-        self.patterns_to_remove = [
-            r'\bevery\b\s+\w+',
-            r'\b(?:tomorrow|today|next|on|at|from|to|daily|weekly|monthly)\b.*$',
-            r'\bon\s+(?:mon|tue|wed|thu|fri|sat|sun)(?:day)?',
-            r'\b(?:mon|tue|wed|thu|fri|sat|sun)(?:day)?',
-            rf'{self._base_time}.*$',
-            r'for\s+\d+\s+(?:day|hour|minute|min)s?.*$',
-            r'(?:alert|remind).*$',
-            r'with\s+\d+\s*(?:minute|min|hour)s?\s+(?:alert|reminder)',
-            r'url\s+https?://\S+',
-            r'@\s*[^@\s][^@]*(?=\s+(?:at|tomorrow|next|\d|\$|$))'  # Remove location markers
-        ]
-
-        # Section patterns
-        self.section_patterns = {
-            'event_type': r'^(meeting|lunch|dinner|coffee|call|zoom|standup|training|class)',
-            'location': r'@\s*([^@](?:.*?@[^@]+)*?.*?)(?=\s+(?:at\s+\d|tomorrow|next|every|$))',  # Handle multiple @ parts
-            'time': r'(?:at\s+)?(\d{1,2}(?::\d{2})?\s*(?:am?|pm?))',
-            'date': r'(tomorrow|today|next\s+\w+|\d{1,2}/\d{1,2}(?:/\d{2,4})?)',
-            'recurrence': r'(every\s+(?:day|week|month|year|monday|tuesday|wednesday|thursday|friday|saturday|mon|tue|wed|thu|fri|sat|sun))',
-        }
+        self._location_cache = None
+        self._now = None
+        # The parse_event and verify_location memos belong to this
+        # processor, so new calendars or config here only drop this
+        # processor's results
+        self._parse_event_cached = functools.lru_cache(maxsize=256)(self._parse_event_at)
+        self._verify_location_cached = functools.lru_cache(maxsize=256)(self._verify_location)
+        # Calendars and config are loaded on first access
+        self._calendars = None
+        self._calendar_index = None
+        self._config = None
 
-        # Recurrence patterns - order matters!
-        self.recurrence_patterns = {
-            # Multiple days pattern (must come before single day)
-            rf'every\s+({self.weekdays})(?:\s+and\s+({self.weekdays}))+': 
-                lambda x: f'FREQ=WEEKLY;BYDAY={",".join(self.weekday_map[day.lower()] for day in re.findall(rf"{self.weekdays}", x.group(0)))}',
-            
-            # Until date pattern (must come before single day)
-            rf'every\s+({self.weekdays})\s+until\s+(\d{{1,2}}/\d{{1,2}}(?:/\d{{2,4}})?)\b':
-                lambda x: f'FREQ=WEEKLY;BYDAY={self.weekday_map[x.group(1).lower()]};UNTIL={self._parse_until_date(x.group(2))}',
-            
-            # Single day pattern
-            rf'every\s+({self.weekdays})\b': 
-                lambda x: f'FREQ=WEEKLY;BYDAY={self.weekday_map[x.group(1).lower()]}',
-            
-            # Simple frequencies
-            r'every\s+week(?:ly)?\b': 'FREQ=WEEKLY',
-            r'every\s+day|daily\b': 'FREQ=DAILY',
-            r'every\s+month|monthly\b': 'FREQ=MONTHLY',
-            r'every\s+year|yearly|annually\b': 'FREQ=YEARLY',
-        }
+    @property
+    def calendars(self) -> List[str]:
+        """Writable calendars, fetched on first access"""
+        if self._calendars is None:
+            self.calendars = self.get_available_calendars()
+        return self._calendars
+
+    @calendars.setter
+    def calendars(self, calendars: List[str]):
+        """Set the calendar list and index it by case-folded name"""
+        self._calendars = calendars
+        # The first of several names differing only by case wins, as before
+        self._calendar_index = {}
+        for cal in calendars:
+            self._calendar_index.setdefault(cal.casefold(), cal)
+        self._parse_event_cached.cache_clear()
+
+    @property
+    def calendar_index(self) -> Dict[str, str]:
+        """Calendars by case-folded name, fetching them on first access"""
+        if self._calendar_index is None:
+            self.calendars = self.get_available_calendars()
+        return self._calendar_index
+
+    @property
+    def config(self) -> Dict:
+        """Configuration, loaded on first access; this also fetches the calendars"""
+        if self._config is None:
+            self._config = self.load_config()
+        return self._config
+
+    @config.setter
+    def config(self, config: Dict):
+        self._config = config
+        self._parse_event_cached.cache_clear()
 
     def _parse_until_date(self, date_str: str) -> str:
         """Parse until date and return formatted string"""
-        today = datetime.now()
+        today = self._current_time()
         parts = date_str.split('/')
         if len(parts) == 2:
             month, date = parts
@@ -272,15 +524,15 @@ class CalendarNLPProcessor:
 
     def parse_date_range(self, text: str) -> Optional[Tuple[datetime, datetime]]:
         """Parse date range from text with better date handling"""
-        match = re.search(self.date_range_pattern, text, re.IGNORECASE)
+        match = _DATE_RANGE_RE.search(text)
         if match:
             start_str, end_str = match.groups()
             try:
-                today = datetime.now()
+                today = self._current_time()
                 
                 # Parse dates with default year handling
-                start_date = parser.parse(start_str, default=today)
-                end_date = parser.parse(end_str, default=today)
+                start_date = _parse_range_date(start_str, today)
+                end_date = _parse_range_date(end_str, today)
                 
                 # If end date is before start date, try next month/year
                 if end_date < start_date:
@@ -289,6 +541,7 @@ class CalendarNLPProcessor:
                         end_date = end_date.replace(year=end_date.year + 1)
                     else:
                         # Different month, might be next month
+                        from dateutil import relativedelta
                         end_date = end_date + relativedelta(months=1)
                         if end_date < start_date:
                             end_date = end_date.replace(year=end_date.year + 1)
@@ -306,18 +559,12 @@ class CalendarNLPProcessor:
         
         try:
             with open(config_file, 'r') as f:
-                config = json.load(f)
+                config = json_loads(f.read())
                 # Verify that default calendar exists
-                if config.get('default_calendar'):
-                    # Find exact match ignoring case
-                    matching_calendars = [cal for cal in self.calendars 
-                                    if cal.lower() == config['default_calendar'].lower()]
-                    if matching_calendars:
-                        config['default_calendar'] = matching_calendars[0]
-                    else:
-                        config['default_calendar'] = "Calendar"
-                else:
-                    config['default_calendar'] = "Calendar"
+                # Find exact match ignoring case
+                default_cal = config.get('default_calendar')
+                matched = default_cal and self.calendar_index.get(default_cal.casefold())
+                config['default_calendar'] = matched or "Calendar"
                 return config
         except Exception as e:
             print(f"Error loading config: {str(e)}", file=sys.stderr)
@@ -325,30 +572,25 @@ class CalendarNLPProcessor:
 
     def get_available_calendars(self) -> List[str]:
         """Get list of available and writable calendars"""
-        script = '''
-        tell application "Calendar"
-            set calList to {}
-            repeat with calItem in calendars
-                try
-                    if writable of calItem then
-                        copy (name of calItem as string) to the end of calList
-                    end if
-                end try
-            end repeat
-            return calList
-        end tell
-        '''
+        # Use the list cached by an earlier run, ALFRED_FORCE_REFRESH=1 skips it
+        if os.getenv('ALFRED_FORCE_REFRESH') != '1':
+            # An expired list is still used; a detached process fetches
+            # a fresh one for the next run
+            calendars = load_calendar_cache_refreshing()
+            if calendars:
+                return calendars
+        import subprocess  # Only needed when the cache can't answer
         try:
-            result = subprocess.run(['osascript', '-e', script],
-                                  capture_output=True,
-                                  text=True,
-                                  check=True)
-            calendars = [cal.strip() for cal in result.stdout.strip().split(',')]
+            calendars = fetch_writable_calendars()
             if not calendars:
                 print("Warning: No writable calendars found", file=sys.stderr)
                 return ["Calendar"]
+            try:
+                save_calendar_cache(calendars)
+            except OSError as e:
+                print(f"Error saving calendar cache: {e}", file=sys.stderr)
             return calendars
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError, ValueError) as e:
             print(f"Error getting calendars: {e}", file=sys.stderr)
             return ["Calendar"]
 
@@ -357,7 +599,7 @@ class CalendarNLPProcessor:
         print(f"Debug - Input text: {text}", file=sys.stderr)
         
         # First check for explicit calendar selection with #
-        calendar_match = re.search(self.calendar_pattern, text)
+        calendar_match = CALENDAR_TAG_RE.search(text)
         if calendar_match:
             # Get the first non-None group (only one should match)
             requested_calendar = next((g for g in calendar_match.groups() if g is not None), None)
@@ -365,18 +607,15 @@ class CalendarNLPProcessor:
                 # Print for debugging
                 print(f"Debug - Found calendar: {requested_calendar}", file=sys.stderr)
                 # Verify calendar exists in available calendars
-                matching_calendars = [cal for cal in self.calendars 
-                                if cal.lower() == requested_calendar.lower()]
-                if matching_calendars:
-                    print(f"Debug - Matched calendar: {matching_calendars[0]}", file=sys.stderr)
-                    return matching_calendars[0]
+                matched = self.calendar_index.get(requested_calendar.casefold())
+                if matched:
+                    print(f"Debug - Matched calendar: {matched}", file=sys.stderr)
+                    return matched
         
         # Use default calendar from config
         default_cal = self.config.get('default_calendar')
-        if default_cal and any(cal.lower() == default_cal.lower() for cal in self.calendars):
-            matching_cals = [cal for cal in self.calendars 
-                        if cal.lower() == default_cal.lower()]
-            return matching_cals[0]
+        if default_cal:
+            return self.calendar_index.get(default_cal.casefold(), "Calendar")
         
         return "Calendar"
 
@@ -386,161 +625,122 @@ class CalendarNLPProcessor:
         default_duration = 60
         
         # Try to match time range pattern
-        match = re.search(self.duration_patterns['time_range'], text, re.IGNORECASE)
+        match = _TIME_RANGE_RE.search(text)
         if match:
             start_hour, start_min, start_meridiem, end_hour, end_min, end_meridiem = match.groups()
             
-            # Convert to 24-hour format
-            start_hour = int(start_hour)
-            end_hour = int(end_hour)
-            start_min = int(start_min) if start_min else 0
-            end_min = int(end_min) if end_min else 0
-            
-            # Handle meridiem (AM/PM)
-            start_meridiem = start_meridiem.lower() if start_meridiem else end_meridiem.lower()
-            end_meridiem = end_meridiem.lower() if end_meridiem else start_meridiem.lower()
-            
-            # Adjust hours for PM
-            if start_meridiem and 'p' in start_meridiem and start_hour != 12:
-                start_hour += 12
-            if end_meridiem and 'p' in end_meridiem and end_hour != 12:
-                end_hour += 12
-            
-            # Handle 12 AM/PM special cases
-            if start_hour == 12:
-                if start_meridiem and 'a' in start_meridiem:
-                    start_hour = 0
-            if end_hour == 12:
-                if end_meridiem and 'a' in end_meridiem:
-                    end_hour = 0
-            
-            # Calculate duration in minutes
-            start_minutes = start_hour * 60 + start_min
-            end_minutes = end_hour * 60 + end_min
-            
-            # Handle crossing midnight
-            if end_minutes < start_minutes:
-                end_minutes += 24 * 60
-            
-            duration = end_minutes - start_minutes
-            return duration if duration > 0 else default_duration
+            # A range like "2-3pm" shares its one meridiem; with none at all
+            # the hours are taken as 24-hour
+            start_meridiem = start_meridiem or end_meridiem
+            end_meridiem = end_meridiem or start_meridiem
+            return _range_minutes(
+                to_24_hour(int(start_hour), start_meridiem) * 60 + int(start_min or 0),
+                to_24_hour(int(end_hour), end_meridiem) * 60 + int(end_min or 0),
+                default_duration)
             
         return default_duration
 
     def clean_title(self, text: str) -> str:
         """Clean up the title"""
-        title = text
-        for pattern in self.patterns_to_remove:
-            title = re.sub(pattern, '', title, flags=re.IGNORECASE)
+        if not _TITLE_PREFILTER_RE.search(text):
+            return ' '.join(text.split())
+        
+        title = _REMOVE_RE.sub('', text)
+        title = _LOCATION_MARKER_RE.sub('', title)
         
         # Remove URLs and notes
-        for pattern in self.url_patterns + self.notes_patterns:
-            title = re.sub(pattern, '', title, flags=re.IGNORECASE)
+        title = _URL_RE.sub('', title)
+        for pattern in _NOTES_PATTERNS:
+            title = pattern.sub('', title)
         
         # Clean up remaining artifacts
-        title = re.sub(r'\s+for\s*$', '', title)
-        title = re.sub(r'\s+in\s*$', '', title)
-        title = re.sub(r'\s+at\s*$', '', title)
-        title = re.sub(r'\s+', ' ', title)
+        title = _TRAILING_WORDS_RE.sub('', title)
         
-        return title.strip()
+        return ' '.join(title.split())
 
     def verify_location(self, location: str) -> Tuple[bool, Optional[str]]:
-        """Verify location using macOS Contacts and Maps
+        """Verify location, reusing results cached by this processor or earlier runs
         Returns: (is_valid, formatted_location)
         """
-        # First check Contacts with more detail
-        contacts_script = '''
-            tell application "Contacts"
-                set matchingContacts to {}
-                repeat with theContact in every person
-                    set contactMatches to {}
-                    repeat with theAddress in every address of theContact
-                        set addressText to formatted address of theAddress as string
-                        if addressText contains "%s" then
-                            -- Get contact details
-                            set contactName to name of theContact
-                            set addressLabel to label of theAddress
-                            if addressLabel is missing value then
-                                set addressLabel to "address"
-                            end if
-                            -- Format as JSON-like string
-                            set contactInfo to contactName & "|" & addressLabel & "|" & addressText
-                            copy contactInfo to the end of contactMatches
-                        end if
-                    end repeat
-                    if length of contactMatches > 0 then
-                        copy contactMatches to the end of matchingContacts
-                    end if
-                end repeat
-                return matchingContacts
-            end tell
-        ''' % location.replace('"', '\\"')
+        return self._verify_location_cached(location)
+
+    def _verify_location(self, location: str) -> Tuple[bool, Optional[str]]:
+        """verify_location without the per-processor memo"""
+        cache = self._load_location_cache()
+        entry = cache.get(location)
+        if entry and time.time() - entry[2] < LOCATION_CACHE_TTL:
+            return entry[0], entry[1]
         
+        result = self._lookup_location(location)
+        if result is None:
+            # The lookup itself failed, e.g. Contacts access is still
+            # pending; saving that would hide the location for days
+            return False, location
+        is_valid, formatted_location = result
+        cache[location] = [is_valid, formatted_location, time.time()]
+        self._save_location_cache(cache)
+        return is_valid, formatted_location
+
+    def _load_location_cache(self) -> Dict:
+        """Load verified locations from the workflow data dir, once per processor"""
+        if self._location_cache is None:
+            cache_file = os.path.join(get_workflow_data_dir(), 'location_cache.json')
+            try:
+                with open(cache_file, 'r') as f:
+                    self._location_cache = json_loads(f.read())
+            except (OSError, ValueError):
+                self._location_cache = {}
+        return self._location_cache
+
+    def _save_location_cache(self, cache: Dict):
+        """Save verified locations in the background, dropping expired entries"""
+        now = time.time()
+        live = {loc: entry for loc, entry in cache.items() if now - entry[2] < LOCATION_CACHE_TTL}
         try:
-            result = subprocess.run(['osascript', '-e', contacts_script],
-                                  capture_output=True,
-                                  text=True,
-                                  check=True)
-            if result.stdout.strip():
-                # Process multiple matches
-                matches = result.stdout.strip().split(', ')
-                if len(matches) > 1:
-                    # Multiple matches found - format them for selection
-                    formatted_matches = []
-                    for match in matches:
-                        name, label, address = match.split('|')
-                        formatted_matches.append(f"{name} ({label}): {address}")
-                    # Return the most relevant match (first one for now)
-                    # Could be enhanced to use fuzzy matching or other relevance criteria
-                    return True, formatted_matches[0]
-                else:
-                    # Single match
-                    name, label, address = matches[0].split('|')
-                    return True, f"{name} ({label}): {address}"
-        except subprocess.CalledProcessError:
-            pass
-
-        # Then check Maps
-        maps_script = '''
-            tell application "Maps"
-                try
-                    set searchResults to search for "%s"
-                    set matchingLocations to {}
-                    repeat with i from 1 to count of searchResults
-                        if i > 3 then exit repeat -- Limit to top 3 results
-                        set theResult to item i of searchResults
-                        copy (name of theResult & "|" & address of theResult) to the end of matchingLocations
-                    end repeat
-                    return matchingLocations
-                on error
-                    return ""
-                end try
-            end tell
-        ''' % location.replace('"', '\\"')
+            # Serialized here, as verify_location may change the cache while it's written
+            write_file_deferred(os.path.join(get_workflow_data_dir(), 'location_cache.json'),
+                                json_dumps(live))
+        except OSError as e:
+            logger.error(f"Failed to save location cache: {e}")
+
+    def lookup_location(self, location: str) -> Tuple[bool, Optional[str]]:
+        """Look up location in macOS Contacts and Maps
+        Returns: (is_valid, formatted_location)
+        """
+        return self._lookup_location(location) or (False, location)
+
+    def _lookup_location(self, location: str) -> Optional[Tuple[bool, Optional[str]]]:
+        """lookup_location, or None when the lookup failed rather than found nothing"""
+        # Contacts answers in-process through PyObjC
+        matches = search_contact_addresses(location)
+        if matches:
+            # Return the most relevant match (first one for now)
+            # Could be enhanced to use fuzzy matching or other relevance criteria
+            name, label, address = matches[0].split('|', 2)
+            return True, f"{name} ({label}): {address}"
         
+        # Without PyObjC, one osascript run checks Contacts and then Maps
+        if matches is None:
+            name, script = 'location_lookup', _LOCATION_LOOKUP_SCRIPT
+        else:
+            name, script = 'maps_lookup', _MAPS_LOOKUP_SCRIPT
+        import subprocess
         try:
-            result = subprocess.run(['osascript', '-e', maps_script],
-                                  capture_output=True,
-                                  text=True,
-                                  check=True)
-            if result.stdout.strip():
-                # Process multiple matches from Maps
-                matches = result.stdout.strip().split(', ')
-                if len(matches) > 1:
-                    # Multiple matches - format them for selection
-                    formatted_matches = []
-                    for match in matches:
-                        name, address = match.split('|')
-                        formatted_matches.append(f"{name} ({address})")
-                    # Return most relevant (first) match
-                    return True, formatted_matches[0]
-                else:
-                    # Single match
-                    name, address = matches[0].split('|')
-                    return True, f"{name} ({address})"
-        except subprocess.CalledProcessError:
-            pass
+            result = run_applescript(name, script, [location])
+            # The first entry names the source that matched
+            output = result.stdout.decode('utf-8').rstrip('\n')
+            source, *matches = output.split(_MATCH_SEP)
+            if source == 'contacts':
+                name, label, address = matches[0].split('|', 2)
+                return True, f"{name} ({label}): {address}"
+            if source == 'maps':
+                # Maps ranks its results, so the first one is the most relevant
+                name, address = matches[0].split('|', 1)
+                return True, f"{name} ({address})"
+            if source == 'failed':
+                return None
+        except (OSError, subprocess.CalledProcessError):
+            return None
             
         # If not found, return original location
         return False, location
@@ -556,43 +756,49 @@ class CalendarNLPProcessor:
             'remaining': text
         }
         
-        # Extract each section
-        for section_type, pattern in self.section_patterns.items():
-            match = re.search(pattern, sections['remaining'], re.IGNORECASE)
-            if match:
-                sections[section_type] = match.group(1)
-                sections['remaining'] = re.sub(pattern, '', sections['remaining'], count=1)
+        # Walk the text once; the first span of each section wins and is cut
+        # from the remaining text
+        pieces = []
+        last = 0
+        for match in _SECTIONS_RE.finditer(text):
+            section_type = match.lastgroup
+            if sections[section_type] is None:
+                sections[section_type] = match.group(section_type)
+                pieces.append(text[last:match.start()])
+                last = match.end()
+        if pieces:
+            pieces.append(text[last:])
+            sections['remaining'] = ''.join(pieces)
         
         return sections
 
     def parse_location(self, text: str) -> Optional[str]:
         """Extract location from text with verification"""
         # Pre-process text to handle no spaces around @
-        text = re.sub(r'(?<=[A-Za-z0-9])@(?=[A-Za-z0-9])', ' @ ', text)
+        text = _GLUED_AT_RE.sub(' @ ', text)
         
         # Find location after @
-        match = re.search(self.location_pattern, text, re.IGNORECASE)
+        match = _LOCATION_RE.search(text)
         if not match:
             return None
             
         location = match.group(1).strip()
         
         # Skip if contains special keywords
-        if any(p in location.lower() for p in ['notes:', 'url:', 'link:', 'alert', 'remind']):
+        if _LOCATION_SKIP_RE.search(location.lower()):
             return None
         
         # Handle ordinal numbers
-        for pattern, repl in self.ordinal_patterns:
-            location = re.sub(pattern, repl, location)
+        location = _ORDINAL_RE.sub(r'\1\2', location)
         
         # Add space between text and numbers
-        location = re.sub(r'([A-Za-z])(\d)', r'\1 \2', location)
+        location = _LETTER_DIGIT_RE.sub(r'\1 \2', location)
         
         # Clean up extra spaces
-        location = re.sub(r'\s+', ' ', location).strip()
+        location = _SPACES_RE.sub(' ', location).strip()
         
         # Remove trailing words
-        location = re.sub(r'\s+(?:tomorrow|today|next|every)\s*$', '', location, flags=re.IGNORECASE)
+        location = _TRAILING_DATE_WORD_RE.sub('', location)
         
         # Verify and format
         is_valid, formatted_location = self.verify_location(location)
@@ -600,64 +806,29 @@ class CalendarNLPProcessor:
             return formatted_location
         return location
     
-    def clean_location(self, text: str, time_str: str = '') -> Optional[str]:
-        """Clean up location string"""
-        if not text:
-            return None
-
-        cleaned = text.strip()
-        
-        # Remove specific words and patterns
-        for pattern in self.clean_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
-        
-        # Clean up extra whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        
-        return cleaned if cleaned else None
-
     def _extract_notes(self, text: str) -> Tuple[Optional[str], str]:
-        for pattern in self.notes_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _NOTES_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip(), text.replace(match.group(0), '')
         return None, text
 
-    def _extract_zoom_url(self, text: str) -> Optional[str]:
-        zoom_pattern = r'(?:url:\s*|link:\s*|)(https?://(?:[\w-]+\.)*zoom\.us/[^\s]+)'
-        zoom_match = re.search(zoom_pattern, text, re.IGNORECASE)
-        if zoom_match:
-            return zoom_match.group(1).rstrip('.,;')
-        return None
-
-    def _extract_general_url(self, text: str) -> Optional[str]:
-        general_pattern = r'(?:url:\s*|link:\s*|)(https?://[^\s]+)'
-        url_match = re.search(general_pattern, text, re.IGNORECASE)
-        if url_match:
-            potential_url = url_match.group(1).rstrip('.,;')
-            try:
-                result = urllib.parse.urlparse(potential_url)
-                if all([result.scheme, result.netloc]):
-                    return potential_url
-            except Exception:
-                pass
-        return None
-
     def parse_url_and_notes(self, text: str) -> Tuple[Optional[str], Optional[str]]:
         """Extract URL and notes from text"""
         url = None
         notes = None
         
-        # Try URL patterns first
-        for pattern in self.url_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                url = match.group(1).strip()
-                break
+        # Find the first URL in one scan; a labeled URL later in the text
+        # still wins over a bare meeting link
+        match = _URL_RE.search(text)
+        if match:
+            if match.lastgroup != 'labeled':
+                match = _LABELED_URL_RE.search(text, match.start() + 1) or match
+            url = match.group(match.lastgroup).strip()
         
         # Then try notes patterns
-        for pattern in self.notes_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _NOTES_PATTERNS:
+            match = pattern.search(text)
             if match:
                 notes = match.group(1).strip()
                 break
@@ -666,24 +837,34 @@ class CalendarNLPProcessor:
 
     def parse_recurrence(self, text: str) -> Optional[str]:
         """Extract recurrence pattern from text"""
-        if not re.search(r'\bevery\b', text.lower()):
-            return None
-            
         text_lower = text.lower()
+        if not _EVERY_RE.search(text_lower):
+            return None
         
-        # Try each pattern
-        for pattern, format_str in self.recurrence_patterns.items():
-            match = re.search(pattern, text_lower)
-            if match:
-                if callable(format_str):
-                    return format_str(match)
-                return format_str
+        # One scan; the highest priority rule found wins
+        best = None
+        for match in _RECURRENCE_RE.finditer(text_lower):
+            if best is None or _RECURRENCE_RANK[match.lastgroup] < _RECURRENCE_RANK[best.lastgroup]:
+                best = match
+                if match.lastgroup == 'multi':
+                    break
+        if best is None:
+            return None
         
-        return None
+        rule = best.lastgroup
+        if rule == 'multi':
+            days = [best.group('first_day')] + _WEEKDAYS_RE.findall(best.group('multi'))
+            return f'FREQ=WEEKLY;BYDAY={",".join(_WEEKDAY_CODES[day[:3]] for day in days)}'
+        if rule == 'until':
+            return (f'FREQ=WEEKLY;BYDAY={_WEEKDAY_CODES[best.group("first_day")[:3]]};'
+                    f'UNTIL={self._parse_until_date(best.group("until_date"))}')
+        if rule == 'single':
+            return f'FREQ=WEEKLY;BYDAY={_WEEKDAY_CODES[best.group("first_day")[:3]]}'
+        return _SIMPLE_RECURRENCE[rule]
 
     def fix_relative_date(self, base_date: datetime, text: str) -> datetime:
         """Fix relative dates based on current date"""
-        today = datetime.now()
+        today = self._current_time()
         text_lower = text.lower()
         
         if 'tomorrow' in text_lower:
@@ -703,8 +884,7 @@ class CalendarNLPProcessor:
                 target_date = today + timedelta(days=7)
             else:
                 # For other cases, ensure date is in the future
-                while target_date <= today:
-                    target_date += timedelta(days=7)
+                target_date = _next_week_after(target_date, today)
             
             # Copy time from base_date to target_date
             return target_date.replace(
@@ -713,11 +893,8 @@ class CalendarNLPProcessor:
                 second=0,
                 microsecond=0
             )
-        elif any(day in text_lower for day in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']):
-            target_date = base_date
-            while target_date <= today:
-                target_date += timedelta(days=7)
-            return target_date
+        elif _FULL_WEEKDAY_RE.search(text_lower):
+            return _next_week_after(base_date, today)
         
         return base_date
 
@@ -725,31 +902,56 @@ class CalendarNLPProcessor:
         """Extract alert times from text"""
         alerts = set()
         
-        # Process each alert pattern
-        for pattern, unit in self.alert_patterns.items():
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.VERBOSE)
-            for match in matches:
-                if unit == 'natural_hour':
-                    alerts.add(60)  # 1 hour in minutes
-                elif unit == 'natural_half':
-                    alerts.add(30)  # 30 minutes
-                else:
-                    time_val = int(match.group(1))
-                    if unit == 'hours':
-                        time_val *= 60
-                    alerts.add(time_val)
+        # One scan, dispatching on the branch that matched
+        for match in _ALERT_RE.finditer(text):
+            branch = match.lastindex
+            minutes, counted = _ALERT_MINUTES[branch]
+            alerts.add(int(match.group(branch + 1)) * minutes if counted else minutes)
         
         return sorted(alerts) if alerts else [15]
 
     def parse_time(self, text: str, base_date: datetime) -> datetime:
         """Parse time from text"""
-        match = re.search(self.time_pattern, text, re.IGNORECASE)
+        match = TIME_PATTERN_RE.search(text)
         if match:
             hour, minutes = parse_time_match(match)
             return base_date.replace(hour=hour, minute=minutes, second=0, microsecond=0)
+        match = _RELATIVE_TIME_RE.search(text)
+        if match:
+            amount = int(match.group(1))
+            if match.group('hours') is not None:
+                return base_date + timedelta(hours=amount)
+            return base_date + timedelta(minutes=amount)
         return base_date
 
     def parse_event(self, text: str) -> dict:
+        """Parse event details from text
+
+        Repeats of a text within the same minute reuse the earlier result,
+        so times taken from the clock may lag by up to a minute.
+        """
+        # The clock is read once, so the minute the result is cached under
+        # is the minute it was parsed at
+        now = datetime.now().replace(second=0, microsecond=0)
+        event_details = self._parse_event_cached(text, now)
+        # Copy, the cached dict and its alerts list are shared
+        return dict(event_details, alerts=list(event_details['alerts']))
+
+    def _parse_event_at(self, text: str, now: datetime) -> dict:
+        """parse_event at the minute now, memoized per processor on both arguments"""
+        # Every sub-parser reads this one time, so they can't disagree
+        # when the clock ticks over mid-parse
+        self._now = now
+        try:
+            return self._parse_event(text)
+        finally:
+            self._now = None
+
+    def _current_time(self) -> datetime:
+        """Time the running parse_event started at, or the clock outside of one"""
+        return self._now or datetime.now()
+
+    def _parse_event(self, text: str) -> dict:
         """Parse event details from text"""
         logger.debug(f"Parsing event text: {text}")
         # Initialize basic event structure
@@ -764,10 +966,18 @@ class CalendarNLPProcessor:
         }
         
         try:
+            # Sub-parsers whose marker isn't in the text can't match and
+            # are skipped; the URL cleanup only removes characters, so
+            # markers missing from text are missing from clean_text too
+            features = {match.lastgroup for match in _FEATURE_RE.finditer(text)}
+            
             # Parse components
-            url, notes = self.parse_url_and_notes(text)
-            logger.debug(f"Extracted URL: {url}, Notes: {notes}")
-            clean_text = self._clean_text_for_parsing(text, url)
+            url = notes = None
+            clean_text = text
+            if 'link' in features:
+                url, notes = self.parse_url_and_notes(text)
+                logger.debug(f"Extracted URL: {url}, Notes: {notes}")
+                clean_text = self._clean_text_for_parsing(text, url)
             
             # Set title first
             event_details['title'] = self.clean_title(clean_text)
@@ -778,42 +988,40 @@ class CalendarNLPProcessor:
                 event_details['calendar'] = calendar_name
             
             # Parse date/time
-            date_range = self.parse_date_range(clean_text)
+            date_range = self.parse_date_range(clean_text) if 'range' in features else None
             if date_range:
                 start_date, end_date = date_range
             else:
                 base_date = self._get_base_date(clean_text)
-                start_date = self.parse_time(clean_text, base_date)
-                duration = self.parse_duration(clean_text)
+                if 'number' in features:
+                    start_date = self.parse_time(clean_text, base_date)
+                    duration = self.parse_duration(clean_text)
+                else:
+                    start_date, duration = base_date, 60
                 end_date = start_date + timedelta(minutes=duration)
             
-            # Update date/time fields
+            # Update date/time fields, sliced from "YYYY-MM-DD HH:MM:SS[.ffffff]"
+            start_iso = start_date.isoformat(' ')
+            end_iso = end_date.isoformat(' ')
             event_details.update({
-                'start_date': start_date.strftime('%Y-%m-%d'),
-                'start_time': start_date.strftime('%H:%M:%S'),
-                'end_date': end_date.strftime('%Y-%m-%d'),
-                'end_time': end_date.strftime('%H:%M:%S'),
+                'start_date': start_iso[:10],
+                'start_time': start_iso[11:19],
+                'end_date': end_iso[:10],
+                'end_time': end_iso[11:19],
             })
             
             # Parse alerts
-            alerts = self.parse_alerts(clean_text)
-            if alerts:
-                event_details['alerts'] = alerts
-            
-            # Add optional fields
-            location = self.parse_location(clean_text)
-            if location:
-                event_details['location'] = location
-            
-            if url:
-                event_details['url'] = url
-            
-            if notes:
-                event_details['notes'] = notes
+            if 'alert' in features:
+                event_details['alerts'] = self.parse_alerts(clean_text)
             
-            recurrence = self.parse_recurrence(clean_text)
-            if recurrence:
-                event_details['recurrence'] = recurrence
+            # Add optional fields, leaving out any that came back empty
+            optional_fields = (
+                ('location', self.parse_location(clean_text) if 'place' in features else None),
+                ('url', url),
+                ('notes', notes),
+                ('recurrence', self.parse_recurrence(clean_text) if 'recur' in features else None),
+            )
+            event_details.update((key, value) for key, value in optional_fields if value)
             
             logger.debug(f"Final event details: {event_details}")
             return event_details
@@ -821,19 +1029,23 @@ class CalendarNLPProcessor:
             logger.error(f"Error parsing event: {e}", exc_info=True)
             event_details['error'] = str(e)
             return event_details
+
+    def parse_many(self, texts: Iterable[str]) -> List[dict]:
+        """Parse several event texts, sharing calendars, config and caches"""
+        parse_event = self.parse_event
+        return [parse_event(text) for text in texts]
         
     def _clean_text_for_parsing(self, text: str, url: Optional[str]) -> str:
         """Clean text for parsing"""
-        clean_text = text
-        if url:
-            clean_text = re.sub(r'(?:url|link):\s*' + re.escape(url), '', clean_text)
-        clean_text = re.sub(r'(?:url|link):\s*https?://\S+', '', clean_text)
-        clean_text = re.sub(r'https?://\S+', '', clean_text)
+        clean_text = _CLEAN_RE.sub('', text)
+        if url and not url.startswith(('http://', 'https://')):
+            # A meeting link without a scheme escapes the pattern above
+            clean_text = _labeled_url_re(url).sub('', clean_text)
         return clean_text
     
     def _get_base_date(self, text: str) -> datetime:
         """Get base date from text"""
-        today = datetime.now()
+        today = self._current_time()
         text_lower = text.lower()
         
         if 'tomorrow' in text_lower:
@@ -842,32 +1054,22 @@ class CalendarNLPProcessor:
             return today + timedelta(days=7)
         
         # Handle specific weekdays
-        for day in self.weekday_map:
-            if day in text_lower:
-                current_weekday = today.weekday()
-                target_weekday = list(self.weekday_map.keys()).index(day) % 7
-                days_ahead = (target_weekday - current_weekday) % 7
-                if days_ahead == 0:  # If it's the same day, move to next week
-                    days_ahead = 7
-                return today + timedelta(days=days_ahead)
+        match = _WEEKDAY_WORD_RE.search(text_lower)
+        if match:
+            days_ahead = _days_until_weekday(today.weekday(), _WEEKDAY_NUMBERS[match.group()])
+            return today + timedelta(days=days_ahead)
                 
         return today
-    
-    def _add_optional_fields(self, event_details: dict, text: str, url: Optional[str], notes: Optional[str]):
-        """Add optional fields to event details"""
-        location = self.parse_location(text)
-        if location:
-            event_details['location'] = location
-            
-        if url:
-            event_details['url'] = url
-            
-        if notes:
-            event_details['notes'] = notes
-            
-        recurrence = self.parse_recurrence(text)
-        if recurrence:
-            event_details['recurrence'] = recurrence
+
+# Processor shared by every get_processor() caller in this process
+_processor = None
+
+def get_processor() -> CalendarNLPProcessor:
+    """Processor for this process, so callers share its calendars, config and memo"""
+    global _processor
+    if _processor is None:
+        _processor = CalendarNLPProcessor()
+    return _processor
 
 def main():
     if len(sys.argv) < 2:
@@ -875,34 +1077,19 @@ def main():
         sys.exit(1)
         
     text = sys.argv[1]
-    processor = CalendarNLPProcessor()
-    event = processor.parse_event(text)
+    event = get_processor().parse_event(text)
     
     # Add debug logging
     logger.debug(f"Event details before creation: {event}")
     
-    # Call create_event.py with event data
+    # Create the event in this process instead of starting a second Python
+    # for create_event.py; run as a script, the workflow dir is on sys.path
+    from create_event import event_response
     try:
-        event_json = json.dumps(event)
-        create_event_script = os.path.join(os.path.dirname(__file__), 'create_event.py')
-        
-        # Add debug logging
-        logger.debug(f"Running create_event.py with: {event_json}")
-        logger.debug(f"Script path: {create_event_script}")
-        
-        result = subprocess.run(
-            [sys.executable, create_event_script, event_json],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        logger.debug(f"Create event output: {result.stdout}")
-        logger.debug(f"Create event stderr: {result.stderr}")
-        print(result.stdout)
-    except subprocess.CalledProcessError as e:
+        print(event_response(event))
+    except Exception as e:
         logger.error(f"Failed to create event: {e}")
-        logger.error(f"Stderr: {e.stderr}")
-        print(json.dumps({
+        print(json_dumps({
             "alfredworkflow": {
                 "arg": f"Error creating event: {e}",
                 "variables": {
@@ -3,100 +3,189 @@
 
 import sys
 import json
-import subprocess
 import os
-import re
-import logging
-
-def get_workflow_data_dir():
-    """Get Alfred workflow data directory, create if it doesn't exist"""
-    data_dir = os.getenv('alfred_workflow_data')
-    if not data_dir:
-        data_dir = os.path.expanduser('~/Library/Application Support/Alfred/Workflow Data/com.ariestwn.calendar.nlp')
-    
-    # Create directory if it doesn't exist
-    os.makedirs(data_dir, exist_ok=True)
-    return data_dir
-
-# Setup logging in Alfred's data directory
-data_dir = get_workflow_data_dir()
-log_file = os.path.join(data_dir, 'calendar_profile.log')
-logging.basicConfig(
-    filename=log_file,
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+from json.encoder import encode_basestring_ascii
 
-class CalendarProfileManager:
+from utils import (get_workflow_data_dir, write_file_atomic, sort_calendar_names,
+                   fetch_writable_calendars, load_calendar_cache, CALENDAR_CACHE_TTL,
+                   load_calendar_cache_refreshing, save_calendar_cache,
+                   json_dumps, json_loads)
+
+class _LazyLog:
+    """Logs to calendar_profile.log, setting up logging only on first use
+
+    Debug messages are dropped without importing logging unless
+    ALFRED_CAL_DEBUG=1, so the usual keystroke never pays for it.
+    """
     def __init__(self):
-        self.calendars = self.get_available_calendars()
+        self.debug_enabled = os.getenv('ALFRED_CAL_DEBUG') == '1'
+        self._logger = None
+
+    def _get_logger(self):
+        if self._logger is None:
+            import logging
+            # Setup logging in Alfred's data directory
+            log_file = os.path.join(get_workflow_data_dir(), 'calendar_profile.log')
+            logging.basicConfig(
+                filename=log_file,
+                level=logging.DEBUG if self.debug_enabled else logging.INFO,
+                format='%(asctime)s - %(levelname)s - %(message)s'
+            )
+            self._logger = logging.getLogger()
+        return self._logger
+
+    def debug(self, msg, *args):
+        if self.debug_enabled:
+            self._get_logger().debug(msg, *args)
+
+    def error(self, msg, *args):
+        self._get_logger().error(msg, *args)
+
+log = _LazyLog()
+
+# Alfred item templates; %s slots take already JSON-encoded strings
+_DEFAULT_ITEM_TMPL = ('{"title":%s,"subtitle":"Current default calendar",'
+                      '"valid":false,"icon":{"path":"icon.png"}}')
+_ITEM_TMPL = ('{"title":%s,"subtitle":"Press Enter to set as default calendar",'
+              '"arg":%s,"valid":true,"icon":{"path":"icon.png"}}')
+
+# Parsed configs by path, reused while the file's mtime is unchanged
+_config_cache = {}
+
+# Calendars osascript returned in this process, shared by every manager
+_fetched_calendars = None
+
+class CalendarProfileManager:
+    def __init__(self, refresh=False):
         data_dir = get_workflow_data_dir()
         self.config_file = os.path.join(data_dir, 'calendar_config.json')
-        self.config = {}  # Initialize config as empty dictionary
-        self.load_config()  # Call load_config to fill self.config
-        logging.debug(f"Calendars: {self.calendars}")
-        logging.debug(f"Config: {self.config}")
+        self.refresh = refresh
+        # Calendars and config are loaded on first access
+        self._calendars = None
+        self._calendar_set = None
+        self._calendars_cf = None
+        self._config = None
+
+    @property
+    def calendars(self):
+        """Writable calendars as a tuple, from the cache or a fresh osascript query
+
+        The tuple is shared with the per-process memo, so it must not change.
+        """
+        if self._calendars is None:
+            if not self.refresh:
+                self._calendars = self._load_calendar_cache()
+            if self._calendars is None:
+                self._calendars = self.get_available_calendars()
+            log.debug("Calendars: %s", self._calendars)
+        return self._calendars
+
+    @property
+    def calendar_set(self):
+        """Calendar names as a set for membership checks"""
+        if self._calendar_set is None:
+            self._calendar_set = frozenset(self.calendars)
+        return self._calendar_set
+
+    @property
+    def calendars_cf(self):
+        """Case-folded calendar names, parallel to calendars, for filtering"""
+        if self._calendars_cf is None:
+            self._calendars_cf = tuple(cal.casefold() for cal in self.calendars)
+        return self._calendars_cf
+
+    @property
+    def config(self):
+        """Configuration, loaded from file on first access"""
+        if self._config is None:
+            self._config = {}
+            self.load_config()
+        return self._config
+
+    @config.setter
+    def config(self, value):
+        self._config = value
+
+    def has_calendar(self, calendar_name):
+        """Check a calendar name, trusting an unexpired cached list before querying Calendar"""
+        if self._calendars is None:
+            cached = load_calendar_cache(CALENDAR_CACHE_TTL)
+            if cached is not None and calendar_name in cached:
+                return True
+        # An expired list may still name a deleted calendar; calendar_set
+        # is this manager's list, queried at most once
+        return calendar_name in self.calendar_set
 
     def sort_calendars(self, calendars):
         """Sort calendars with numbers and alphabetically"""
-        def sort_key(name):
-            parts = re.split(r'(\d+)', name)
-            parts = [int(part) if part.isdigit() else part.lower() for part in parts]
-            return parts
-        
-        return sorted(calendars, key=sort_key)
+        return sort_calendar_names(calendars)
 
     def get_available_calendars(self):
         """Get list of available and writable calendars"""
-        script = '''
-        tell application "Calendar"
-            set calList to {}
-            repeat with calItem in calendars
-                try
-                    if writable of calItem then
-                        copy (name of calItem as string) to the end of calList
-                    end if
-                end try
-            end repeat
-            return calList
-        end tell
-        '''
+        global _fetched_calendars
+        if _fetched_calendars is not None:
+            return _fetched_calendars
+        import subprocess  # Only needed when the cache can't answer
         try:
-            result = subprocess.run(['osascript', '-e', script],
-                                  capture_output=True,
-                                  text=True,
-                                  check=True)
-            calendars = [cal.strip() for cal in result.stdout.strip().split(',')]
-            return self.sort_calendars(calendars)
+            calendars = tuple(fetch_writable_calendars())
+            self._save_calendar_cache(calendars)
+            _fetched_calendars = calendars
+            return calendars
         except subprocess.CalledProcessError as e:
-            logging.error(f"Error running AppleScript: {e}")
+            log.error(f"Error running AppleScript: {e}")
             print(f"Error running AppleScript: {e}", file=sys.stderr)
-            return ["Calendar"]
+            return ("Calendar",)
         except Exception as e:
-            logging.error(f"Unexpected error: {e}")
+            log.error(f"Unexpected error: {e}")
             print(f"Unexpected error: {e}", file=sys.stderr)
-            return ["Calendar"]
+            return ("Calendar",)
+
+    def _load_calendar_cache(self):
+        """Load cached calendar list, or None if missing
+
+        An expired list is still returned while a detached process
+        fetches a fresh one for the next run.
+        """
+        calendars = load_calendar_cache_refreshing()
+        if calendars is None:
+            return None
+        log.debug("Using cached calendar list")
+        return tuple(calendars)
+
+    def _save_calendar_cache(self, calendars):
+        """Save calendar list so following invocations can skip osascript"""
+        try:
+            save_calendar_cache(calendars)
+        except OSError as e:
+            log.error(f"Failed to save calendar cache: {e}")
 
     def load_config(self):
         """Load configuration from file"""
-        logging.debug("Loading configuration")
-        if os.path.exists(self.config_file):
-            try:
+        log.debug("Loading configuration")
+        try:
+            mtime = os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            log.debug("Config file not found. Creating new configuration.")
+            self.create_default_config()
+            return
+        try:
+            cached = _config_cache.get(self.config_file)
+            if cached and cached[0] == mtime:
+                self.config = dict(cached[1])
+            else:
                 with open(self.config_file, 'r') as f:
-                    self.config = json.load(f)
-                    if self.config.get('default_calendar') not in self.calendars:
-                        self.config['default_calendar'] = self.calendars[0] if self.calendars else 'Calendar'
-                logging.debug(f"Configuration loaded: {self.config}")
-            except json.JSONDecodeError:
-                logging.error("Corrupted config file. Creating new configuration.")
-                print("Error: Corrupted config file. Creating new configuration.")
-                self.create_default_config()
-            except Exception as e:
-                logging.error(f"Failed to load configuration: {str(e)}")
-                print(f"Error: Failed to load configuration: {str(e)}")
-                self.create_default_config()
-        else:
-            logging.debug("Config file not found. Creating new configuration.")
+                    self.config = json_loads(f.read())
+                _config_cache[self.config_file] = (mtime, dict(self.config))
+            if self.config.get('default_calendar') not in self.calendar_set:
+                self.config['default_calendar'] = self.calendars[0] if self.calendars else 'Calendar'
+            log.debug("Configuration loaded: %s", self.config)
+        except json.JSONDecodeError:
+            log.error("Corrupted config file. Creating new configuration.")
+            print("Error: Corrupted config file. Creating new configuration.")
+            self.create_default_config()
+        except Exception as e:
+            log.error(f"Failed to load configuration: {str(e)}")
+            print(f"Error: Failed to load configuration: {str(e)}")
             self.create_default_config()
 
     def create_default_config(self):
@@ -104,72 +193,63 @@ class CalendarProfileManager:
         self.config = {"default_calendar": self.calendars[0] if self.calendars else 'Calendar'}
         self.save_config(self.config['default_calendar'])
 
-    def save_config(self, calendar_name):
-        """Save configuration to file"""
-        if calendar_name in self.calendars:
+    def save_config(self, calendar_name, validated=False):
+        """Save configuration to file, validated skipping the calendar check"""
+        if validated or self.has_calendar(calendar_name):
             try:
                 # Save only default_calendar
                 self.config = {"default_calendar": calendar_name}
-                
-                with open(self.config_file, 'w') as f:
-                    json.dump(self.config, f, indent=2)
+                write_file_atomic(self.config_file, json_dumps(self.config))
                 return True
             except Exception as e:
                 print(f"Error: Failed to save configuration: {str(e)}")
         return False
 
     def generate_items(self, query=None):
-        """Generate Alfred items"""
+        """Generate the Alfred items JSON"""
         items = []
-        query_lower = query.lower() if query else ""
+        q = query.casefold() if query else ""
         default_cal = self.config.get('default_calendar', '')
         
-        # Filter calendars
-        matching_calendars = [
-            cal for cal in self.calendars 
-            if not query_lower or query_lower in cal.lower()
-        ]
+        # Pin the default to the top when it matches the filter
+        if default_cal in self.calendar_set and (not q or q in default_cal.casefold()):
+            items.append(_DEFAULT_ITEM_TMPL % encode_basestring_ascii(f"✓ {default_cal}"))
         
-        # Move default to top
-        if default_cal in matching_calendars:
-            matching_calendars.remove(default_cal)
-            items.append({
-                "title": f"✓ {default_cal}",
-                "subtitle": "Current default calendar",
-                "valid": False,
-                "icon": {
-                    "path": "icon.png"
-                }
-            })
-        
-        # Add other calendars
-        for cal in matching_calendars:
-            items.append({
-                "title": cal,
-                "subtitle": "Press Enter to set as default calendar",
-                "arg": f"--set:{cal}",
-                "valid": True,
-                "icon": {
-                    "path": "icon.png"
-                }
-            })
+        if not q:
+            # No filter, the common case: every calendar except the default
+            items.extend(_ITEM_TMPL % (encode_basestring_ascii(cal),
+                                       encode_basestring_ascii(f"--set:{cal}"))
+                         for cal in self.calendars if cal != default_cal)
+        else:
+            # Typing usually matches a prefix, so startswith settles most
+            # names before the substring scan
+            for cal, cf in zip(self.calendars, self.calendars_cf):
+                if cal == default_cal or (not cf.startswith(q) and q not in cf):
+                    continue
+                items.append(_ITEM_TMPL % (encode_basestring_ascii(cal),
+                                           encode_basestring_ascii(f"--set:{cal}")))
         
-        return items
+        return '{"items":[%s]}' % ','.join(items)
 
 def main():
-    logging.debug("Starting program")
-    manager = CalendarProfileManager()
+    log.debug("Starting program")
+    args = sys.argv[1:]
+    # --refresh forces a fresh calendar query instead of the cached list
+    refresh = bool(args) and args[0] == "--refresh"
+    if refresh:
+        args = args[1:]
+    manager = CalendarProfileManager(refresh=refresh)
     
-    if len(sys.argv) > 1:
-        arg = " ".join(sys.argv[1:])
-        logging.debug(f"Received argument: {arg}")
+    if args:
+        arg = " ".join(args)
+        log.debug("Received argument: %s", arg)
         if arg.startswith("--set:"):
             # Remove all occurrences of "--set:" from argument
             calendar_name = arg.replace("--set:", "").strip()
-            logging.debug(f"Attempting to set calendar: {calendar_name}")
-            if calendar_name in manager.calendars:
-                if manager.save_config(calendar_name):
-                    output = json.dumps({
+            log.debug("Attempting to set calendar: %s", calendar_name)
+            if manager.has_calendar(calendar_name):
+                if manager.save_config(calendar_name, validated=True):
+                    output = json_dumps({
                         "alfredworkflow": {
                             "arg": f"📅 {calendar_name}",
                             "variables": {
@@ -178,10 +258,10 @@ def main():
                             }
                         }
                     })
-                    logging.debug(f"Output: {output}")
+                    log.debug("Output: %s", output)
                     print(output)
                 else:
-                    output = json.dumps({
+                    output = json_dumps({
                         "alfredworkflow": {
                             "arg": f"Failed to set calendar '{calendar_name}'",
                             "variables": {
@@ -190,10 +270,10 @@ def main():
                             }
                         }
                     })
-                    logging.error(f"Failed to set calendar: {calendar_name}")
+                    log.error(f"Failed to set calendar: {calendar_name}")
                     print(output)
             else:
-                output = json.dumps({
+                output = json_dumps({
                     "alfredworkflow": {
                         "arg": f"Calendar '{calendar_name}' not found",
                         "variables": {
@@ -202,19 +282,17 @@ def main():
                         }
                     }
                 })
-                logging.error(f"Calendar not found: {calendar_name}")
+                log.error(f"Calendar not found: {calendar_name}")
                 print(output)
         else:
             # Show filtered list
-            items = manager.generate_items(arg)
-            output = json.dumps({"items": items})
-            logging.debug(f"Output: {output}")
+            output = manager.generate_items(arg)
+            log.debug("Output: %s", output)
             print(output)
     else:
         # Show all calendars
-        items = manager.generate_items()
-        output = json.dumps({"items": items})
-        logging.debug(f"Output: {output}")
+        output = manager.generate_items()
+        log.debug("Output: %s", output)
         print(output)
 
 if __name__ == "__main__":
@@ -2,9 +2,10 @@
 import sys
 import json
 import subprocess
-from typing import Dict
-import logging
+from typing import Dict, List, Optional, Tuple, Union
 import os
+from datetime import datetime, timedelta
+from json.encoder import encode_basestring_ascii
 
 # Setup imports
 if __name__ == '__main__':
@@ -14,82 +15,186 @@ if __name__ == '__main__':
 # Now import workflow modules
 from logger import setup_logger
 from config import get_testing_mode
+from utils import run_applescript, json_dumps, json_loads
 
 # Get logger
 logger = setup_logger('create_event', testing=get_testing_mode())
 
-def create_calendar_event(event: Dict) -> bool:
-    """Create calendar event using AppleScript"""
-    logger.debug(f"Creating event: {event}")
-    
-    # Parse dates into components
-    start_year = event['start_date'][:4]
-    start_month = int(event['start_date'][5:7])
-    start_day = int(event['start_date'][8:10])
-    start_hour = int(event['start_time'][:2])
-    start_min = int(event['start_time'][3:5])
-    
-    end_year = event['end_date'][:4]
-    end_month = int(event['end_date'][5:7])
-    end_day = int(event['end_date'][8:10])
-    end_hour = int(event['end_time'][:2])
-    end_min = int(event['end_time'][3:5])
+# Alfred response for a created event; the %s slot takes a JSON-encoded string
+_SUCCESS_TMPL = ('{"alfredworkflow":{"arg":%s,'
+                 '"variables":{"notificationTitle":"Calendar Event"}}}')
+
+# Adds every event passed on the command line, 12 arguments per event in
+# event_script_args order; empty optional fields are skipped. The start
+# arrives as numbers for makeDate: a "date" string literal would be parsed
+# with the user's locale settings, and the day is set to 1 first so a month
+# shorter than today's day can't roll the date over. The end is the start
+# plus the duration in seconds. Alerts are comma-separated minutes.
+_EVENT_SCRIPT = '''on makeDate(y, m, d, t)
+    set theDate to current date
+    set {day of theDate, year of theDate, month of theDate, day of theDate, time of theDate} to {1, y, m, d, t}
+    return theDate
+end makeDate
+
+on run argv
+    tell application "Calendar"
+        repeat with i from 1 to count of argv by 12
+            set {calName, eventTitle, y, m, d, t, durationSecs, alertsText, eventLocation, eventUrl, eventNotes, eventRule} to items i thru (i + 11) of argv
+            set startDate to my makeDate(y as integer, m as integer, d as integer, t as integer)
+            set endDate to startDate + (durationSecs as integer)
+            tell calendar calName
+                set newEvent to make new event at end of events with properties {summary:eventTitle, start date:startDate, end date:endDate}
+                if eventLocation is not "" then set location of newEvent to eventLocation
+                if eventUrl is not "" then set url of newEvent to eventUrl
+                if eventNotes is not "" then set description of newEvent to eventNotes
+                if eventRule is not "" then set recurrence of newEvent to eventRule
+                if alertsText is not "" then
+                    set AppleScript's text item delimiters to ","
+                    set alertList to text items of alertsText
+                    set AppleScript's text item delimiters to ""
+                    repeat with alertMinutes in alertList
+                        make new display alarm at end of display alarms of newEvent with properties {trigger interval:-(alertMinutes as integer)}
+                    end repeat
+                end if
+            end tell
+        end repeat
+    end tell
+end run'''
+
+def _make_date_args(event: Dict, which: str) -> Tuple[int, int, int, int]:
+    """makeDate arguments for the event's 'start' or 'end', time in seconds since midnight"""
+    date, clock = event[f'{which}_date'], event[f'{which}_time']
+    return (int(date[:4]), int(date[5:7]), int(date[8:10]),
+            int(clock[:2]) * 3600 + int(clock[3:5]) * 60)
+
+def _event_datetime(event: Dict, which: str) -> datetime:
+    """The event's 'start' or 'end' as a naive local datetime"""
+    year, month, day, seconds = _make_date_args(event, which)
+    return datetime(year, month, day) + timedelta(seconds=seconds)
+
+def event_script_args(event: Dict) -> List[str]:
+    """The 12 _EVENT_SCRIPT arguments that add one event"""
+    args = [event['calendar'], event['title']]
+    args.extend(map(str, _make_date_args(event, 'start')))
+    duration = _event_datetime(event, 'end') - _event_datetime(event, 'start')
+    args.append(str(int(duration.total_seconds())))
+    args.append(','.join(str(int(m)) for m in event.get('alerts') or ()))
+    # recurrence is an RRULE string such as FREQ=WEEKLY;BYDAY=MO
+    args.extend(event.get(key) or '' for key in ('location', 'url', 'notes', 'recurrence'))
+    return args
+
+def _eventkit_create_events(events: List[Dict]) -> Optional[bool]:
+    """Save events straight into the calendar database through EventKit
+
+    Returns None when EventKit can't take the batch: PyObjC is missing,
+    calendar access isn't granted, or an event has a recurrence (EventKit
+    has no RRULE parser). The caller falls back to osascript then.
+    """
+    if any(e.get('recurrence') for e in events):
+        return None
+    try:
+        from EventKit import (EKEventStore, EKEvent, EKAlarm, EKEntityTypeEvent,
+                              EKAuthorizationStatusAuthorized, EKSpanThisEvent)
+        from Foundation import NSDate, NSURL
+    except ImportError:
+        return None
+    if EKEventStore.authorizationStatusForEntityType_(EKEntityTypeEvent) != EKAuthorizationStatusAuthorized:
+        return None
     
-    # Build base properties
-    properties = [
-        f'summary:"{event["title"]}"',
-        f'start date:startDate',
-        f'end date:endDate'
-    ]
+    store = EKEventStore.alloc().init()
+    calendars = {str(cal.title()): cal
+                 for cal in store.calendarsForEntityType_(EKEntityTypeEvent) or []
+                 if cal.allowsContentModifications()}
     
-    # Add optional properties
-    if event.get('location'):
-        properties.append(f'location:"{event["location"]}"')
-    if event.get('url'):
-        properties.append(f'url:"{event["url"]}"')
-    if event.get('notes'):
-        properties.append(f'description:"{event["notes"]}"')
+    for e in events:
+        calendar = calendars.get(e['calendar'])
+        if calendar is None:
+            logger.error(f"Error: calendar not found: {e['calendar']}")
+            store.reset()
+            return False
+        ek_event = EKEvent.eventWithEventStore_(store)
+        ek_event.setCalendar_(calendar)
+        ek_event.setTitle_(e['title'])
+        ek_event.setStartDate_(NSDate.dateWithTimeIntervalSince1970_(
+            _event_datetime(e, 'start').timestamp()))
+        ek_event.setEndDate_(NSDate.dateWithTimeIntervalSince1970_(
+            _event_datetime(e, 'end').timestamp()))
+        if e.get('location'):
+            ek_event.setLocation_(e['location'])
+        if e.get('notes'):
+            ek_event.setNotes_(e['notes'])
+        if e.get('url'):
+            url = NSURL.URLWithString_(e['url'])
+            if url is not None:
+                ek_event.setURL_(url)
+        for minutes in e.get('alerts') or ():
+            ek_event.addAlarm_(EKAlarm.alarmWithRelativeOffset_(-60 * minutes))
+        
+        # Commit once for the whole batch below
+        ok, error = store.saveEvent_span_commit_error_(ek_event, EKSpanThisEvent, False, None)
+        if not ok:
+            logger.error(f"Error: {error}")
+            store.reset()
+            return False
     
-    # Join properties with commas
-    properties_str = ', '.join(properties)
+    ok, error = store.commit_(None)
+    if not ok:
+        logger.error(f"Error: {error}")
+        return False
+    return True
+
+def create_calendar_event(event: Union[Dict, List[Dict]]) -> bool:
+    """Create one event, or a list of them
+
+    EventKit saves the events in-process when PyObjC is installed and
+    calendar access is granted. Otherwise every event is passed to one
+    run of _EVENT_SCRIPT, so a batch pays for one osascript spawn and one
+    Calendar session.
+    """
+    events = event if isinstance(event, list) else [event]
+    logger.debug("Creating events: %s", events)
     
-    # Build AppleScript command - note the careful spacing and no trailing whitespace
-    script = f'''tell application "Calendar"
-    tell calendar "{event['calendar']}"
-        set startDate to current date
-        set year of startDate to {start_year}
-        set month of startDate to {start_month}
-        set day of startDate to {start_day}
-        set hours of startDate to {start_hour}
-        set minutes of startDate to {start_min}
-        set seconds of startDate to 0
-        
-        set endDate to current date
-        set year of endDate to {end_year}
-        set month of endDate to {end_month}
-        set day of endDate to {end_day}
-        set hours of endDate to {end_hour}
-        set minutes of endDate to {end_min}
-        set seconds of endDate to 0
-        
-        make new event at end of events with properties {{{properties_str}}}
-    end tell
-end tell'''
+    created = _eventkit_create_events(events)
+    if created is not None:
+        if not created:
+            print("Error creating event through EventKit", file=sys.stderr)
+        return created
     
-    logger.debug(f"AppleScript: {script}")
+    args = [arg for e in events for arg in event_script_args(e)]
+    logger.debug("AppleScript arguments: %s", args)
     
     try:
-        result = subprocess.run(['osascript', '-e', script], 
-                              capture_output=True,
-                              text=True,
-                              check=True)
-        logger.debug(f"Success: {result.stdout}")
+        result = run_applescript('create_event', _EVENT_SCRIPT, args)
+        # Outside testing mode this is the lazy logger's no-op debug, so
+        # formatting waits until a real logger emits the message
+        logger.debug("Success: %s", result.stdout.decode('utf-8', 'replace'))
         return True
     except subprocess.CalledProcessError as e:
-        logger.error(f"Error: {e.stderr}")
+        err = e.stderr.decode('utf-8', 'replace') if e.stderr else ''
+        logger.error(f"Error: {err}")
         print(f"Error creating event: {e}", file=sys.stderr)
         return False
 
+def event_response(event: Union[Dict, List[Dict]]) -> str:
+    """Create one event or a list of them, returning the Alfred response JSON"""
+    if create_calendar_event(event):
+        if isinstance(event, list):
+            message = f"{len(event)} events created successfully"
+        else:
+            message = "Event created successfully"
+        result = _SUCCESS_TMPL % encode_basestring_ascii(message)
+        logger.debug("Success response: %s", result)
+        return result
+    logger.error(f"Failed to create event")
+    return json_dumps({
+        "alfredworkflow": {
+            "arg": "Failed to create event",
+            "variables": {
+                "notificationTitle": "Error"
+            }
+        }
+    })
+
 def main():
     if len(sys.argv) < 2:
         logger.error("No event data provided")
@@ -98,32 +203,11 @@ def main():
         
     event_json = sys.argv[1]
     try:
-        logger.debug(f"Received event JSON: {event_json}")
-        event = json.loads(event_json)
-        logger.debug(f"Parsed event: {event}")
-        
-        if create_calendar_event(event):
-            result = json.dumps({
-                "alfredworkflow": {
-                    "arg": "Event created successfully",
-                    "variables": {
-                        "notificationTitle": "Calendar Event"
-                    }
-                }
-            })
-            logger.debug(f"Success response: {result}")
-            print(result)
-        else:
-            result = json.dumps({
-                "alfredworkflow": {
-                    "arg": "Failed to create event",
-                    "variables": {
-                        "notificationTitle": "Error"
-                    }
-                }
-            })
-            logger.error(f"Failed to create event")
-            print(result)
+        logger.debug("Received event JSON: %s", event_json)
+        # A JSON list creates all of its events in one osascript run
+        event = json_loads(event_json)
+        logger.debug("Parsed event: %s", event)
+        print(event_response(event))
     except json.JSONDecodeError as e:
         logger.error(f"Invalid event data format: {e}")
         print("Invalid event data format")
@@ -1,11 +1,38 @@
 #!/usr/bin/env python3
 import os
-import logging
 import json
 from datetime import datetime
 
+class _LazyLogger:
+    """Stands in for a logger while testing mode is off
+
+    Nothing configures logging then, so debug and info messages fall below
+    the default WARNING level and are dropped without importing logging.
+    Anything else gets the real logger, set up on first use.
+    """
+    def __init__(self, name):
+        self.name = name
+        self._logger = None
+
+    def debug(self, msg, *args, **kwargs):
+        pass
+
+    info = debug
+
+    def __getattr__(self, attr):
+        if self._logger is None:
+            import logging
+            self._logger = logging.getLogger(self.name)
+        return getattr(self._logger, attr)
+
 def setup_logger(name, testing=False):
     """Setup logger that can be toggled for testing"""
+    if not testing:
+        # Every launch is a fresh process, so skip importing logging
+        # until a message is actually emitted
+        return _LazyLogger(name)
+    
+    import logging
     logger = logging.getLogger(name)
     
     # Only setup handler if testing is enabled and none exists
@@ -3,8 +3,8 @@
 
 import sys
 import os
-import json
 import re
+import functools
 from datetime import datetime, timedelta
 from typing import Optional, List
 
@@ -14,37 +14,73 @@ if __name__ == '__main__':
     setup_imports()
 
 # Now import workflow modules
-from __init__ import build_time_pattern, parse_time_match
+from __init__ import TIME_PATTERN_RE, CALENDAR_TAG_RE, parse_time_match
 from logger import setup_logger
 from config import get_testing_mode
+from utils import get_workflow_data_dir, load_calendar_cache, json_dumps, json_loads
 
 # Get logger
 logger = setup_logger('preview', testing=get_testing_mode())
 
-def get_workflow_data_dir():
-    """Get Alfred workflow data directory"""
-    data_dir = os.getenv('alfred_workflow_data')
-    if not data_dir:
-        data_dir = os.path.expanduser('~/Library/Application Support/Alfred/Workflow Data/com.ariestwn.calendar.nlp')
-    os.makedirs(data_dir, exist_ok=True)
-    return data_dir
+# The location pattern is compiled once here; calling re.search with a string
+# pays a pattern-cache lookup on every call
+_LOCATION_RE = re.compile(r'(?:^|\s)(?:at|in)\s+([^,\.\d][^,\.]*?)(?=\s+(?:on|at|from|tomorrow|today|next|every|\d{1,2}(?::\d{2})?(?:am|pm)|url:|notes?:|link:)|\s*$)')
+
+# Date/time markers that cut the title from themselves to the end, as one
+# alternation: a sequence of such cuts keeps the text before the earliest
+# one, which is where the leftmost branch matches. "with N min alert" needs
+# no pattern of its own, the alert marker already cuts it
+_TITLE_TO_END_RE = re.compile(
+    r'(?:\b(?:tomorrow|today|next|on|at|from|to|every|daily|weekly|monthly)\b|'
+    r'\d{1,2}(?::\d{2})?\s*(?:am|pm)|'
+    r'for\s+\d+\s+(?:day|hour|minute|min)s?|'
+    r'alert|remind).*$',
+    re.IGNORECASE)
+# Location phrases, removed after the cut since they run to the title end
+_TITLE_LOCATION_RE = re.compile(r'(?:^|\s)(?:at|in)\s+([^,\.\d][^,\.]*?)(?=\s+|$)', re.IGNORECASE)
+
+# Names strftime's %A and %B give in the C locale Python starts in,
+# indexed by weekday() (Monday is 0) and month - 1
+_WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December')
+
+def _clock_label(hour: int, minute: int) -> str:
+    """The time as strftime('%-I:%M %p') writes it, without the format parser"""
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+@functools.lru_cache(maxsize=256)
+def _format_when(day, hour: int, minute: int, today) -> str:
+    """Label a date and time for the subtitle, relative to today's date
+
+    Keyed on today's date rather than the clock, so entries can't go stale
+    across midnight and no expiry is needed.
+    """
+    clock = _clock_label(hour, minute)
+    if day == today:
+        return f"Today at {clock}"
+    elif day == today + timedelta(days=1):
+        return f"Tomorrow at {clock}"
+    return f"{_WEEKDAY_NAMES[day.weekday()]}, {_MONTH_NAMES[day.month - 1]} {day.day} at {clock}"
 
 class EventPreview:
     def __init__(self):
         logger.debug("Initializing EventPreview")
         # Initialize patterns
-        self.calendar_pattern = r'#(?:"([^"]+)"|\'([^\']+)\'|([^"\'\s]+))'
-        self.time_pattern = build_time_pattern()
-        self.location_pattern = r'(?:^|\s)(?:at|in)\s+([^,\.\d][^,\.]*?)(?=\s+(?:on|at|from|tomorrow|today|next|every|\d{1,2}(?::\d{2})?(?:am|pm)|url:|notes?:|link:)|\s*$)'
+        self.calendar_pattern = CALENDAR_TAG_RE
+        self.time_pattern = TIME_PATTERN_RE
+        self.location_pattern = _LOCATION_RE
         
         # Load default calendar from config
         config_file = os.path.join(get_workflow_data_dir(), 'calendar_config.json')
         try:
             with open(config_file, 'r') as f:
-                config = json.load(f)
+                config = json_loads(f.read())
                 self.default_calendar = config.get('default_calendar', 'Calendar')
         except:
             self.default_calendar = 'Calendar'
+        # Cached calendar names by case-folded name, loaded on first use
+        self._calendar_index = None
         
         # Weekday mapping for date parsing
         self.weekdays = {
@@ -56,32 +92,43 @@ class EventPreview:
 
     def get_calendar(self, text: str) -> str:
         """Extract calendar name from text or use default"""
-        calendar_match = re.search(self.calendar_pattern, text)
+        calendar_match = self.calendar_pattern.search(text)
         if calendar_match:
             # Only get the first non-None group
             requested_calendar = next((g for g in calendar_match.groups() if g is not None), None)
             if requested_calendar:
                 # Print for debugging
                 print(f"Debug - Calendar found in preview: {requested_calendar}", file=sys.stderr)
-                return requested_calendar.strip()
+                # Show the calendar's own spelling, as the event will use it
+                requested_calendar = requested_calendar.strip()
+                return self.calendar_index.get(requested_calendar.casefold(), requested_calendar)
         return self.default_calendar
 
-    def parse_time(self, text: str) -> Optional[datetime]:
-        """Parse time from text"""
-        match = re.search(self.time_pattern, text, re.IGNORECASE)
+    @property
+    def calendar_index(self) -> dict:
+        """Calendar names from the shared cache, keyed by their case-folded form"""
+        if self._calendar_index is None:
+            self._calendar_index = {}
+            for cal in load_calendar_cache() or ():
+                self._calendar_index.setdefault(cal.casefold(), cal)
+        return self._calendar_index
+
+    def parse_time(self, text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Parse time from text, on the day of now (the clock if not given)"""
+        match = self.time_pattern.search(text)
         if match:
             hour, minutes = parse_time_match(match)
-            now = datetime.now()
+            now = now or datetime.now()
             return now.replace(hour=hour, minute=minutes, second=0, microsecond=0)
         return None
 
-    def get_next_weekday(self, weekday_name: str) -> datetime:
-        """Get next occurrence of weekday"""
+    def get_next_weekday(self, weekday_name: str, today: Optional[datetime] = None) -> datetime:
+        """Get next occurrence of weekday after today (the clock if not given)"""
         weekday_name = weekday_name.lower()
         if weekday_name not in self.weekdays:
             return None
         
-        today = datetime.now()
+        today = today or datetime.now()
         target_weekday = self.weekdays[weekday_name]
         days_ahead = (target_weekday - today.weekday()) % 7
         if days_ahead == 0:
@@ -91,22 +138,23 @@ class EventPreview:
     def parse_date(self, text: str) -> str:
         """Parse and format date from text"""
         text_lower = text.lower()
+        # One clock read shared by every step, so they agree across midnight
         today = datetime.now()
         target_date = None
-        target_time = self.parse_time(text_lower)
+        target_time = self.parse_time(text_lower, today)
 
         # Handle recurring events
         if 'every' in text_lower:
             for day in self.weekdays:
                 if day in text_lower:
                     if target_time:
-                        return f"Every {day.capitalize()} at {target_time.strftime('%-I:%M %p')}"
+                        return f"Every {day.capitalize()} at {_clock_label(target_time.hour, target_time.minute)}"
                     return f"Every {day.capitalize()}"
 
         # Handle weekdays
         for day in self.weekdays:
             if day in text_lower:
-                target_date = self.get_next_weekday(day)
+                target_date = self.get_next_weekday(day, today)
                 break
 
         # Handle relative dates
@@ -128,35 +176,25 @@ class EventPreview:
         if not target_date:
             return "Invalid date"
         
-        if target_date.date() == today.date():
-            return f"Today at {target_date.strftime('%-I:%M %p')}"
-        elif target_date.date() == (today + timedelta(days=1)).date():
-            return f"Tomorrow at {target_date.strftime('%-I:%M %p')}"
-        return target_date.strftime("%A, %B %-d at %-I:%M %p")
+        # Compare calendar days only; reuse the clock read above so the
+        # labels can't disagree with target_date across midnight
+        return _format_when(target_date.date(), target_date.hour, target_date.minute,
+                            today.date())
 
     def clean_title(self, text: str) -> str:
         """Clean title from input text"""
         # Remove calendar tag
-        text = re.sub(self.calendar_pattern, '', text)
+        text = self.calendar_pattern.sub('', text)
         
         # Remove date/time patterns
-        patterns_to_remove = [
-            r'\b(?:tomorrow|today|next|on|at|from|to|every|daily|weekly|monthly)\b.*$',
-            r'\d{1,2}(?::(\d{2}))?\s*(?:am|pm).*$',
-            r'for\s+\d+\s+(?:day|hour|minute|min)s?.*$',
-            r'(?:alert|remind).*$',
-            r'with\s+\d+\s*(?:minute|min|hour)s?\s+(?:alert|reminder)',
-            r'(?:^|\s)(?:at|in)\s+([^,\.\d][^,\.]*?)(?=\s+|$)'
-        ]
-        
-        for pattern in patterns_to_remove:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        text = _TITLE_TO_END_RE.sub('', text)
+        text = _TITLE_LOCATION_RE.sub('', text)
         
         return ' '.join(text.split())
 
     def parse_location(self, text: str) -> Optional[str]:
         """Extract location from text"""
-        match = re.search(self.location_pattern, text)
+        match = self.location_pattern.search(text)
         if match:
             location = match.group(1).strip()
             return location
@@ -189,7 +227,7 @@ class EventPreview:
 
 def main():
     if len(sys.argv) < 2:
-        print(json.dumps({
+        print(json_dumps({
             "items": [{
                 "title": "Type event details...",
                 "subtitle": "Use natural language to describe your event",
@@ -202,7 +240,7 @@ def main():
     query = " ".join(sys.argv[1:])
     preview = EventPreview()
     items = preview.generate_items(query)
-    print(json.dumps({"items": items}))
+    print(json_dumps({"items": items}))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
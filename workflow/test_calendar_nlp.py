@@ -3,11 +3,16 @@ from datetime import datetime, timedelta
 from typing import Tuple, Optional
 import os
 import sys
+import json
 
 # Add the parent directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from workflow.calendar_nlp import CalendarNLPProcessor
+from workflow.calendar_nlp import CalendarNLPProcessor, _parse_range_date
+
+# create_event runs as an Alfred script and imports its siblings by name
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from create_event import event_script_args, _make_date_args
 
 class TestCalendarNLP(unittest.TestCase):
     def setUp(self):
@@ -75,6 +80,23 @@ class TestCalendarNLP(unittest.TestCase):
                 print(f"Debug - Parsed time: {parsed_time}")
                 self.assertEqual(parsed_time, expected_time)
 
+    def test_relative_time(self):
+        """Test start times given relative to now"""
+        test_cases = [
+            ("call mom in 30 minutes", timedelta(minutes=30)),
+            ("standup in 15 min", timedelta(minutes=15)),
+            ("flight check in 2 hours", timedelta(hours=2)),
+            ("break in 5m", timedelta(minutes=5)),
+        ]
+        
+        for input_text, expected_offset in test_cases:
+            with self.subTest(input_text=input_text):
+                before = datetime.now().replace(second=0, microsecond=0)
+                result = self.processor.parse_event(input_text)
+                start = datetime.strptime(f"{result['start_date']} {result['start_time']}", '%Y-%m-%d %H:%M:%S')
+                self.assertNotIn(" in ", f" {result['title']} ")
+                self.assertLessEqual(abs(start - before - expected_offset), timedelta(minutes=1))
+
     def test_location_parsing(self):
         """Test location extraction"""
         test_cases = [
@@ -97,6 +119,7 @@ class TestCalendarNLP(unittest.TestCase):
             ("meeting 2-3pm", 60),
             ("training 9:30am-11:30am", 120),
             ("class 1p-2:30p", 90),
+            ("review 14-15:30", 90),
         ]
         
         for input_text, expected_duration in test_cases:
@@ -106,6 +129,37 @@ class TestCalendarNLP(unittest.TestCase):
                 print(f"Debug - Parsed duration: {result} minutes")
                 self.assertEqual(result, expected_duration)
 
+    def test_parse_many(self):
+        """Test batch parsing returns one parsed event per text, in order"""
+        texts = ["lunch @ Cafe tomorrow at 1pm", "standup every monday 9am #Work", ""]
+        results = self.processor.parse_many(texts)
+        self.assertEqual(len(results), len(texts))
+
+        lunch, standup, empty = results
+        self.assertEqual(lunch['title'], 'lunch')
+        self.assertEqual(lunch['calendar'], 'Calendar')
+        self.assertEqual(lunch['location'], 'Local Cafe (456 Food St)')
+        self.assertEqual(lunch['start_date'], self.tomorrow.strftime('%Y-%m-%d'))
+        self.assertEqual(lunch['start_time'], '13:00:00')
+
+        self.assertEqual(standup['title'], 'standup')
+        self.assertEqual(standup['calendar'], 'Work')
+        self.assertEqual(standup['recurrence'], 'FREQ=WEEKLY;BYDAY=MO')
+        self.assertEqual(datetime.strptime(standup['start_date'], '%Y-%m-%d').weekday(), 0)
+        self.assertEqual(standup['start_time'], '09:00:00')
+
+        self.assertEqual(empty['title'], '')
+        self.assertEqual(empty['calendar'], 'Calendar')
+        self.assertEqual(empty['start_date'], self.now.strftime('%Y-%m-%d'))
+
+    def test_parse_event_is_json(self):
+        """Test parse_event returns only JSON-serializable public fields"""
+        for text in ["lunch tomorrow", "meeting 2-3pm @ Room 5 #Work", ""]:
+            with self.subTest(text=text):
+                result = self.processor.parse_event(text)
+                self.assertFalse([key for key in result if key.startswith('_')])
+                self.assertEqual(json.loads(json.dumps(result)), result)
+
     def test_alerts(self):
         """Test alert/reminder parsing"""
         test_cases = [
@@ -392,5 +446,66 @@ class TestCalendarNLP(unittest.TestCase):
                 print(f"Debug - Parsed time: {parsed_time}")
                 self.assertEqual(parsed_time, expected_time)
 
+    def test_event_script_args(self):
+        """Test the AppleScript arguments built for one event"""
+        event = {
+            'title': 'Late show', 'calendar': 'Work',
+            'start_date': '2026-10-15', 'start_time': '23:00:00',
+            'end_date': '2026-10-16', 'end_time': '01:00:00',
+            'alerts': [15, 60], 'location': 'Cinema',
+            'url': 'https://example.com', 'notes': 'Bring tickets',
+            'recurrence': 'FREQ=WEEKLY;BYDAY=TH',
+        }
+        # The event reaches create_event as JSON, with every date and time a string
+        event = json.loads(json.dumps(event))
+
+        self.assertEqual(_make_date_args(event, 'start'), (2026, 10, 15, 23 * 3600))
+        self.assertEqual(_make_date_args(event, 'end'), (2026, 10, 16, 3600))
+
+        args = event_script_args(event)
+        print(f"\nDebug - Script args: {args}")
+        self.assertEqual(args, [
+            'Work', 'Late show',
+            '2026', '10', '15', str(23 * 3600),
+            # Two hours, across midnight
+            str(2 * 3600),
+            '15,60',
+            'Cinema', 'https://example.com', 'Bring tickets', 'FREQ=WEEKLY;BYDAY=TH',
+        ])
+
+    def test_event_script_args_optional_fields(self):
+        """Test missing optional fields become empty arguments"""
+        result = self.processor.parse_event("meeting tomorrow at 2:30pm")
+        args = event_script_args(json.loads(json.dumps(result)))
+        self.assertEqual(len(args), 12)
+        self.assertEqual(args[:2], ['Calendar', 'meeting'])
+        self.assertEqual(args[2:6], [str(self.tomorrow.year), str(self.tomorrow.month),
+                                     str(self.tomorrow.day), str(14 * 3600 + 30 * 60)])
+        self.assertEqual(args[6], str(3600))
+        self.assertEqual(args[7], '15')
+        self.assertEqual(args[8:], ['', '', '', ''])
+
+    def test_parse_range_date(self):
+        """Test each end of a date range, with missing fields taken from the default"""
+        default = datetime(2026, 3, 5, 0, 0)
+        test_cases = [
+            ("8/9", datetime(2026, 8, 9)),
+            ("8/9/2025", datetime(2025, 8, 9)),
+            ("August 9", datetime(2026, 8, 9)),
+            ("aug 9", datetime(2026, 8, 9)),
+            # Left to dateutil
+            ("8/9/25", datetime(2025, 8, 9)),
+            ("9 August", datetime(2026, 8, 9)),
+            ("2025-08-09", datetime(2025, 8, 9)),
+        ]
+
+        for date_str, expected in test_cases:
+            with self.subTest(date_str=date_str):
+                self.assertEqual(_parse_range_date(date_str, default), expected)
+
+        # Invalid dates aren't quietly built from the default
+        with self.assertRaises(ValueError):
+            _parse_range_date("2/30", default)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
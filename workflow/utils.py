@@ -1,8 +1,263 @@
 import os
+import re
 import sys
+import json
+import time
+
+# orjson encodes and decodes faster when installed; fall back to the stdlib
+try:
+    import orjson
+
+    def json_dumps(obj):
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # orjson rejects integers past 64 bits, the stdlib doesn't
+            return json.dumps(obj, separators=(',', ':'))
+
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
+
+    json_loads = json.loads
 
 def setup_imports():
     """Setup imports to work both as module and direct script"""
     workflow_dir = os.path.dirname(os.path.abspath(__file__))
     if workflow_dir not in sys.path:
-        sys.path.insert(0, workflow_dir) 
\ No newline at end of file
+        sys.path.insert(0, workflow_dir)
+
+def get_workflow_data_dir():
+    """Get Alfred workflow data directory, create if it doesn't exist"""
+    data_dir = os.getenv('alfred_workflow_data')
+    if not data_dir:
+        data_dir = os.path.expanduser('~/Library/Application Support/Alfred/Workflow Data/com.ariestwn.calendar.nlp')
+    
+    # Create directory if it doesn't exist
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+def write_file_atomic(path, text):
+    """Write text to a temp file and rename it over path, so readers never see a partial file
+
+    Each write gets a temp file of its own, so concurrent writers from
+    other Alfred runs can't publish each other's half-written text.
+    """
+    import tempfile  # Only needed once something is written
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                    prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _compiled_applescript(name, source):
+    """Path of source compiled by osacompile into the data dir, or None if that fails
+
+    The file name carries a hash of the source, so a changed script gets a
+    copy of its own; file mtimes can't be trusted for that, as the build
+    keeps the checkout's.
+    """
+    import hashlib  # Only needed when a script actually runs
+    import subprocess
+    digest = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+    path = os.path.join(get_workflow_data_dir(), f'{name}-{digest}.scpt')
+    if os.path.exists(path):
+        return path
+    
+    # Compile next to the target and swap it in, so a concurrent run never
+    # sees a half-written script
+    tmp_path = os.path.join(os.path.dirname(path), f'{name}-{digest}.{os.getpid()}.scpt')
+    try:
+        subprocess.run(['osacompile', '-o', tmp_path],
+                       input=source.encode('utf-8'),
+                       capture_output=True,
+                       check=True)
+        os.replace(tmp_path, path)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Could not compile {name} script: {e}", file=sys.stderr)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    
+    # Drop copies compiled from earlier versions of the source; temp files
+    # of compiles in progress carry a pid and are left alone
+    for entry in os.scandir(os.path.dirname(path)):
+        if (entry.name.startswith(f'{name}-') and entry.name.endswith('.scpt')
+                and entry.name.count('.') == 1 and entry.path != path):
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+    return path
+
+def run_applescript(name, source, args):
+    """Run AppleScript source, passing args to its run handler
+
+    The script runs from a copy compiled once under name, so osascript
+    skips compiling the source every time; without osacompile the source
+    is piped in. Values arrive as arguments, never spliced into the
+    source. Returns the CompletedProcess with bytes output, or raises
+    subprocess.CalledProcessError when the script fails.
+    """
+    import subprocess
+    path = _compiled_applescript(name, source)
+    if path:
+        return subprocess.run(['osascript', path, *args],
+                              capture_output=True,
+                              check=True)
+    return subprocess.run(['osascript', '-', *args],
+                          input=source.encode('utf-8'),
+                          capture_output=True,
+                          check=True)
+
+# Deferred writes waiting for the writer thread, newest text per path
+_pending_writes = {}
+_pending_lock = None
+_write_lock = None
+
+def write_file_deferred(path, text):
+    """Write text to path atomically from a background thread
+
+    The caller returns without waiting on the disk. The thread isn't a
+    daemon, so the interpreter still finishes the write before it exits.
+    When writes to one path pile up, only the newest text is written.
+    """
+    import threading  # Only needed once something is written
+    global _pending_lock, _write_lock
+    if _pending_lock is None:
+        _pending_lock = threading.Lock()
+        _write_lock = threading.Lock()
+    with _pending_lock:
+        queued = path in _pending_writes
+        _pending_writes[path] = text
+    if not queued:
+        threading.Thread(target=_flush_deferred_write, args=(path,)).start()
+
+def _flush_deferred_write(path):
+    # One writer at a time, so writes to a path land in the order queued
+    with _write_lock:
+        with _pending_lock:
+            text = _pending_writes.pop(path)
+        try:
+            write_file_atomic(path, text)
+        except OSError as e:
+            print(f"Failed to write {path}: {e}", file=sys.stderr)
+
+# Calendar list cache shared by the workflow scripts, in the workflow data dir
+CALENDAR_CACHE_FILE = 'calendars_cache.json'
+
+# Seconds a cached calendar list is trusted before a refresh is started
+CALENDAR_CACHE_TTL = 300
+
+# Splits calendar names into alternating text and number runs for sorting
+_DIGIT_SPLIT = re.compile(r'(\d+)')
+
+def sort_calendar_names(calendars):
+    """Sort calendars with numbers and alphabetically"""
+    def sort_key(name):
+        # Split with a capture group puts the number runs at odd indexes
+        parts = _DIGIT_SPLIT.split(name)
+        return [int(part) if i & 1 else part.lower() for i, part in enumerate(parts)]
+    
+    return sorted(calendars, key=sort_key)
+
+def _eventkit_writable_calendars():
+    """Writable calendar names through EventKit, or None without PyObjC or calendar access"""
+    try:
+        from EventKit import EKEventStore, EKEntityTypeEvent, EKAuthorizationStatusAuthorized
+    except ImportError:
+        return None
+    # Without full access the store lists no calendars; skip setting one up
+    # (Authorized shares its value with macOS 14's FullAccess)
+    if EKEventStore.authorizationStatusForEntityType_(EKEntityTypeEvent) != EKAuthorizationStatusAuthorized:
+        return None
+    store = EKEventStore.alloc().init()
+    calendars = store.calendarsForEntityType_(EKEntityTypeEvent) or []
+    return [str(cal.title()) for cal in calendars if cal.allowsContentModifications()]
+
+def fetch_writable_calendars():
+    """Query Calendar for the sorted names of writable calendars
+
+    EventKit answers in-process when PyObjC is installed; without it, or
+    without calendar access, osascript is asked instead. Raises
+    subprocess.CalledProcessError, OSError or ValueError when that fails.
+    """
+    calendars = _eventkit_writable_calendars()
+    if calendars:
+        return sort_calendar_names(calendars)
+    
+    import subprocess  # Only needed when the cache can't answer
+    # JXA returns the names as JSON, so names containing commas survive
+    script = '''
+    const calendars = Application("Calendar").calendars;
+    const names = calendars.name();
+    const writable = calendars.writable();
+    JSON.stringify(names.filter((name, i) => writable[i]));
+    '''
+    result = subprocess.run(['osascript', '-l', 'JavaScript', '-e', script],
+                          capture_output=True,
+                          text=True,
+                          check=True)
+    return sort_calendar_names(json_loads(result.stdout))
+
+def load_calendar_cache(ttl=None):
+    """Load the cached calendar list, or None if missing or older than ttl seconds"""
+    cache_file = os.path.join(get_workflow_data_dir(), CALENDAR_CACHE_FILE)
+    try:
+        mtime = os.stat(cache_file).st_mtime
+        if ttl is not None and time.time() - mtime >= ttl:
+            return None
+        with open(cache_file, 'r') as f:
+            return json_loads(f.read())['calendars']
+    except (OSError, ValueError, KeyError):
+        return None
+
+def load_calendar_cache_refreshing():
+    """Load the cached calendar list, refreshing it in the background once expired
+
+    The expired list is still returned, so the caller doesn't wait on
+    osascript; None only when there's no usable cache at all.
+    """
+    cache_file = os.path.join(get_workflow_data_dir(), CALENDAR_CACHE_FILE)
+    try:
+        age = time.time() - os.stat(cache_file).st_mtime
+        with open(cache_file, 'r') as f:
+            calendars = json_loads(f.read())['calendars']
+    except (OSError, ValueError, KeyError):
+        return None
+    if calendars and age >= CALENDAR_CACHE_TTL:
+        refresh_calendar_cache_in_background()
+    return calendars
+
+def save_calendar_cache(calendars):
+    """Save the calendar list in the background so following invocations can skip osascript"""
+    cache_file = os.path.join(get_workflow_data_dir(), CALENDAR_CACHE_FILE)
+    write_file_deferred(cache_file, json_dumps({"calendars": list(calendars), "mtime": time.time()}))
+
+def refresh_calendar_cache_in_background():
+    """Query the calendar list again in a detached process that rewrites the cache
+
+    The cache's mtime is bumped first, so runs in the meantime keep
+    using the old list instead of starting refreshes of their own.
+    """
+    import subprocess  # Only needed when the cache has expired
+    try:
+        os.utime(os.path.join(get_workflow_data_dir(), CALENDAR_CACHE_FILE))
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), '--refresh-calendars'],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+    except OSError as e:
+        print(f"Failed to refresh calendar cache: {e}", file=sys.stderr)
+
+if __name__ == '__main__' and sys.argv[1:] == ['--refresh-calendars']:
+    save_calendar_cache(fetch_writable_calendars())